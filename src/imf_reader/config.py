@@ -30,4 +30,9 @@ fmt_shell = "%(levelname)s: %(message)s"
 
 shell_formatter = logging.Formatter(fmt_shell)  # Create formatters
 shell_handler.setFormatter(shell_formatter)  # Add formatters to handlers
-logger.addHandler(shell_handler)  # Add handlers to the logger
+
+# Add handlers to the logger once, and don't pass records on to the root logger's handlers
+# so messages are not printed twice
+if not logger.handlers:
+    logger.addHandler(shell_handler)
+logger.propagate = False
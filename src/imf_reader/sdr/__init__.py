@@ -28,6 +28,13 @@ To retrieve SDR holdings and allocations for a specific month and year, eg April
 sdr.fetch_allocations_holdings((2021, 4))
 ```
 
+To retrieve SDR holdings and allocations for every month in a range, eg January to April 2021, pass the start
+and end dates as tuples. The months are fetched concurrently.
+
+```python
+sdr.fetch_allocations_holdings_range((2021, 1), (2021, 4))
+```
+
 Read interest rates
 
 ```python
@@ -45,6 +52,13 @@ By default, the exchange rate is in USDs per 1 SDR. To get the exchange rate in
 sdr.fetch_exchange_rates("USD")
 ```
 
+Fetch holdings and allocations, exchange rates and interest rates concurrently
+
+```python
+sdr.fetch_all()
+```
+The datasets are returned in a dictionary with the keys "allocations_holdings", "exchange_rates" and "interest_rates".
+
 Clear cached data
 
 ```python
@@ -55,5 +69,9 @@ sdr.clear_cache()
 
 from imf_reader.sdr.read_interest_rate import fetch_interest_rates
 from imf_reader.sdr.read_exchange_rate import fetch_exchange_rates
-from imf_reader.sdr.read_announcements import fetch_allocations_holdings
+from imf_reader.sdr.read_announcements import (
+    fetch_allocations_holdings,
+    fetch_allocations_holdings_range,
+)
+from imf_reader.sdr.fetch_all import fetch_all
 from imf_reader.sdr.clear_cache import clear_cache
@@ -5,19 +5,33 @@ from imf_reader.sdr.read_announcements import (
 from imf_reader.sdr.read_exchange_rate import fetch_exchange_rates
 from imf_reader.sdr.read_interest_rate import fetch_interest_rates
 from imf_reader.config import logger
+from imf_reader.utils import clear_disk_cache
+
+# functions which cache SDR data in memory
+CACHED_FUNCTIONS = (
+    get_holdings_and_allocations_data,
+    get_latest_date,
+    fetch_exchange_rates,
+    fetch_interest_rates,
+)
 
 
 def clear_cache():
     """Clear the cache for all SDR data, including holdings and allocations, exchange rates, and interest rates."""
 
-    # clear cache from read_announcements module
-    get_holdings_and_allocations_data.cache_clear()
-    get_latest_date.cache_clear()
+    cleared = False
 
-    # clear cache from read_exchange_rate module
-    fetch_exchange_rates.cache_clear()
+    # clear the in-memory caches which hold any data
+    for func in CACHED_FUNCTIONS:
+        if func.cache_info().currsize:
+            func.cache_clear()
+            cleared = True
 
-    # clear cache from read_interest_rate module
-    fetch_interest_rates.cache_clear()
+    # clear data cached on disk
+    if clear_disk_cache("sdr"):
+        cleared = True
 
-    logger.info("Cache cleared")
+    if cleared:
+        logger.info("Cache cleared")
+    else:
+        logger.info("No cached data to clear")
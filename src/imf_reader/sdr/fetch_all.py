@@ -0,0 +1,41 @@
+"""Module to fetch all the SDR datasets from the IMF website at the same time
+
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Literal
+
+import pandas as pd
+
+from imf_reader.sdr.read_announcements import fetch_allocations_holdings
+from imf_reader.sdr.read_exchange_rate import fetch_exchange_rates
+from imf_reader.sdr.read_interest_rate import fetch_interest_rates
+
+
+def fetch_all(
+    date: tuple[int, int] | None = None,
+    unit_basis: Literal["SDR", "USD"] = "SDR",
+) -> dict[str, pd.DataFrame]:
+    """Fetch SDR holdings and allocations, exchange rates and interest rates at the same time
+
+    The three datasets are requested from the IMF website concurrently, so this is faster than
+    calling each fetch function one after the other.
+
+    Args:
+        date: The year and month to get allocations and holdings data for. e.g. (2024, 11) for November 2024. If None, the latest announcements released are fetched
+        unit_basis: The unit basis for the exchange rate. Default is "SDR" i.e. 1 SDR in USD. Other option is "USD" i.e. 1 USD in SDR
+
+    Returns:
+        A dictionary with the "allocations_holdings", "exchange_rates" and "interest_rates" DataFrames
+    """
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        allocations_holdings = executor.submit(fetch_allocations_holdings, date)
+        exchange_rates = executor.submit(fetch_exchange_rates, unit_basis)
+        interest_rates = executor.submit(fetch_interest_rates)
+
+    return {
+        "allocations_holdings": allocations_holdings.result(),
+        "exchange_rates": exchange_rates.result(),
+        "interest_rates": interest_rates.result(),
+    }
@@ -5,60 +5,108 @@ info: https://www.imf.org/en/About/Factsheets/Sheets/2023/special-drawing-rights
 
 """
 
+from cachetools import cached, TTLCache
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
+from itertools import islice
+from threading import Lock
+import re
+import io
 import pandas as pd
 import calendar
-from bs4 import BeautifulSoup
+from lxml import html
 from datetime import datetime
 
-from imf_reader.utils import make_request
+from imf_reader.utils import (
+    make_request,
+    make_conditional_request,
+    TSV_OPTIONS,
+)
 from imf_reader.config import logger
 
 BASE_URL = "https://www.imf.org/external/np/fin/tad/"
 MAIN_PAGE_URL = "https://www.imf.org/external/np/fin/tad/extsdr1.aspx"
 
+# time in seconds before cached data is refetched
+DATA_CACHE_TTL = 30 * 24 * 60 * 60  # announcements are published monthly
+LATEST_DATE_CACHE_TTL = 60 * 60  # check for a new announcement every hour
+
+# start tags of the tables and rows on the main page
+TABLE_TAG_PATTERN = re.compile(rb"<table\b", re.I)
+ROW_TAG_PATTERN = re.compile(rb"<tr\b", re.I)
+
+# row whose first cell only holds a date, e.g. "November 30, 2023"
+ROW_DATE_PATTERN = re.compile(
+    rb"<tr[^>]*>\s*<td[^>]*>\s*([A-Z][a-z]+ \d{1,2}, \d{4})\s*<", re.I
+)
+
+# columns of the holdings and allocations data
+SDR_COLUMNS = ["entity", "holdings", "allocations"]
+
+# characters stripped from holdings and allocations values before numeric conversion
+NON_NUMERIC_PATTERN = re.compile(r"[^\d.]")
+
 
 def read_tsv(url: str) -> pd.DataFrame:
     """Read a tsv file from a url and return a dataframe"""
 
+    content = make_conditional_request(url, tag="sdr")
+
     try:
-        return pd.read_csv(url, delimiter="/t", engine="python")
+        # the column headers are on the fourth line, after the title and notes
+        df = pd.read_csv(io.BytesIO(content), header=3, **TSV_OPTIONS)
 
-    except pd.errors.ParserError:
+    except (pd.errors.ParserError, pd.errors.EmptyDataError):
         raise ValueError("SDR _data not available for this date")
 
+    # content which is not tab separated, e.g. an error page, is read as a single column
+    if len(df.columns) != len(SDR_COLUMNS):
+        raise ValueError("SDR _data not available for this date")
+
+    return df
+
 
 def clean_df(df: pd.DataFrame) -> pd.DataFrame:
     """Clean the SDR dataframe"""
 
-    df = df.iloc[3:, 0].str.split("\t", expand=True)
-    df.columns = ["entity", "holdings", "allocations"]
+    df = df.set_axis(SDR_COLUMNS, axis=1)
 
-    return df.assign(
-        holdings=lambda d: pd.to_numeric(
-            d.holdings.str.replace(r"[^\d.]", "", regex=True), errors="coerce"
-        ),
-        allocations=lambda d: pd.to_numeric(
-            d.allocations.str.replace(r"[^\d.]", "", regex=True), errors="coerce"
-        ),
-    ).melt(
+    # melt first so the numeric cleaning runs in a single pass over one column
+    return df.melt(
         id_vars="entity", value_vars=["holdings", "allocations"], var_name="indicator"
+    ).assign(
+        value=lambda d: pd.to_numeric(
+            d.value.str.replace(NON_NUMERIC_PATTERN, "", regex=True), errors="coerce"
+        ),
+        # each entity is repeated for both indicators, so store the labels once
+        entity=lambda d: d.entity.astype("category"),
+        indicator=lambda d: d.indicator.astype("category"),
     )
 
 
+@lru_cache(maxsize=None)
+def _last_day(year: int, month: int) -> int:
+    """Return the last day in the month"""
+
+    return calendar.monthrange(year, month)[1]
+
+
 def format_date(month: int, year: int) -> str:
     """Return a date as year-month-day where day is the last day in the month"""
 
-    last_day = calendar.monthrange(year, month)[1]
-    return f"{year}-{month}-{last_day}"
+    return f"{year}-{month}-{_last_day(year, month)}"
 
 
-@lru_cache
+@cached(TTLCache(maxsize=64, ttl=DATA_CACHE_TTL), lock=Lock(), info=True)
 def get_holdings_and_allocations_data(
     year: int,
     month: int,
 ):
-    """Get sdr allocations and holdings data for a given month and year"""
+    """Get sdr allocations and holdings data for a given month and year
+
+    Data for up to 64 months is kept in memory for 30 days, evicting the least recently used month.
+    In a new session, the data is only downloaded again if the IMF website reports that it has changed.
+    """
 
     date = format_date(month, year)
     url = f"{BASE_URL}extsdr2.aspx?date1key={date}&tsvflag=Y"
@@ -67,23 +115,64 @@ def get_holdings_and_allocations_data(
 
     df = read_tsv(url)
     df = clean_df(df)
-    df["date"] = pd.to_datetime(date)
+    df["date"] = pd.Timestamp(
+        year=year, month=month, day=_last_day(year, month)
+    ).as_unit("ns")
 
     return df
 
 
-@lru_cache
+def _find_latest_date(content: bytes) -> str | None:
+    """Find the latest date in the first cell of the second row of the fifth table on the main page
+
+    Only the tags of the fifth table are scanned, so the date is found without parsing the page.
+
+    Args:
+        content: content of the main page
+
+    Returns:
+        The date, or None if the cell is not found or does not hold a date
+    """
+
+    table = next(islice(TABLE_TAG_PATTERN.finditer(content), 4, None), None)
+    if table is None:
+        return None
+
+    table_end = content.find(b"</table", table.end())
+    if table_end == -1:
+        table_end = len(content)
+
+    rows = ROW_TAG_PATTERN.finditer(content, table.end(), table_end)
+    row = next(islice(rows, 1, None), None)
+    if row is None:
+        return None
+
+    match = ROW_DATE_PATTERN.match(content, row.start(), table_end)
+    return match.group(1).decode() if match is not None else None
+
+
+@cached(TTLCache(maxsize=1, ttl=LATEST_DATE_CACHE_TTL), lock=Lock(), info=True)
 def get_latest_date() -> tuple[int, int]:
-    """Get the latest date for which SDR data is available"""
+    """Get the latest date for which SDR data is available
+
+    The latest date is kept in memory for 1 hour.
+    """
 
     logger.info("Fetching latest date")
 
     response = make_request(MAIN_PAGE_URL)
-    soup = BeautifulSoup(response.content, "html.parser")
-    table = soup.find_all("table")[4]
-    row = table.find_all("tr")[1]
+    date = _find_latest_date(response.content)
+
+    if date is None:
+        # fall back to parsing the full page in case the markup has changed
+        tree = html.fromstring(response.content)
+        cells = tree.xpath("(//table)[5]//tr[2]/td[1]")
+        if not cells:
+            raise ValueError("Could not find the latest date on the SDR page")
+
+        # the text of the cell includes the text of any nested markup
+        date = cells[0].text_content().strip()
 
-    date = row.td.text.strip()
     date = datetime.strptime(date, "%B %d, %Y")
 
     # Extract the year and month as a tuple
@@ -104,3 +193,44 @@ def fetch_allocations_holdings(date: tuple[int, int] | None = None) -> pd.DataFr
         date = get_latest_date()
 
     return get_holdings_and_allocations_data(*date)
+
+
+def fetch_allocations_holdings_range(
+    start: tuple[int, int], end: tuple[int, int], max_workers: int = 6
+) -> pd.DataFrame:
+    """Fetch SDR holdings and allocations data for every month in a range of dates
+
+    The months are requested concurrently and combined into a single dataframe.
+
+    Args:
+        start: The first year and month to get allocations and holdings data for. e.g. (2024, 1) for January 2024
+        end: The last year and month to get allocations and holdings data for, inclusive. e.g. (2024, 11) for November 2024
+        max_workers: The maximum number of months to request at the same time
+
+    returns:
+        A dataframe with the SDR allocations and holdings data for all months in the range
+    """
+
+    months = pd.date_range(
+        pd.Timestamp(year=start[0], month=start[1], day=1),
+        pd.Timestamp(year=end[0], month=end[1], day=1),
+        freq="MS",
+    )
+
+    if months.empty:
+        raise ValueError("The start date must be before or the same as the end date")
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        dfs = list(
+            executor.map(
+                lambda month: get_holdings_and_allocations_data(
+                    month.year, month.month
+                ),
+                months,
+            )
+        )
+
+    # months can have different entities, so restore the categories after combining
+    return pd.concat(dfs, ignore_index=True).astype(
+        {"entity": "category", "indicator": "category"}
+    )
@@ -4,16 +4,27 @@ Read about SDR valuation at: https://www.imf.org/external/np/fin/data/rms_sdrv.a
 """
 
 import requests
+import urllib3
 import pandas as pd
-import io
-from functools import lru_cache
+from cachetools import cached, TTLCache
+from threading import Lock
 from typing import Literal
 
 from imf_reader.config import logger
+from imf_reader.utils import (
+    disk_cache,
+    session,
+    REQUEST_TIMEOUT,
+    MEMORY_CACHE_TTL,
+    TSV_OPTIONS,
+)
 
 
 BASE_URL = "https://www.imf.org/external/np/fin/data/rms_sdrv.aspx"
 
+# time in seconds before cached data is refetched
+CACHE_TTL = 24 * 60 * 60  # exchange rates are published daily
+
 
 def get_exchange_rates_data():
     """Read the data from the IMF website"""
@@ -23,29 +34,36 @@ def get_exchange_rates_data():
     }
 
     try:
-        response = requests.post(BASE_URL, data=data)
+        response = session.post(
+            BASE_URL, data=data, timeout=REQUEST_TIMEOUT, stream=True
+        )
         response.raise_for_status()
 
     except requests.exceptions.RequestException as e:
         raise ConnectionError(f"Could not connect to {BASE_URL}. Error: {str(e)}")
 
     try:
-        return pd.read_csv(
-            io.BytesIO(response.content), delimiter="/t", engine="python"
-        )
+        # decompress and parse the body as it streams in instead of buffering it
+        response.raw.decode_content = True
+
+        # the column headers are on the second line, after the title
+        return pd.read_csv(response.raw, header=1, **TSV_OPTIONS)
 
     except pd.errors.ParserError as e:
         raise ValueError(f"Could not parse data. Error: {str(e)}")
 
+    # the connection can fail while the body is being read
+    except (requests.exceptions.RequestException, urllib3.exceptions.HTTPError) as e:
+        raise ConnectionError(f"Could not connect to {BASE_URL}. Error: {str(e)}")
+
+    finally:
+        response.close()
+
 
 def preprocess_data(df: pd.DataFrame):
     """
-    Preprocess the input DataFrame by splitting columns and setting headers.
+    Preprocess the input DataFrame by checking the required columns are present.
     """
-    df = df.iloc[:, 0].str.split("\t", expand=True)
-    df.columns = df.iloc[0]
-    df = df.iloc[1:].reset_index(drop=True)
-
     # Ensure required columns are present
     required_columns = ["Report date"]
     for column in required_columns:
@@ -55,27 +73,6 @@ def preprocess_data(df: pd.DataFrame):
     return df
 
 
-def extract_exchange_series(df: pd.DataFrame, col_val: str):
-    """
-    Extract the exchange rate series for the given column value.
-    """
-    return (
-        df.loc[lambda d: d["Report date"] == col_val].iloc[:, 1].reset_index(drop=True)
-    )
-
-
-def extract_dates_series(df: pd.DataFrame):
-    """
-    Extract the dates series from the DataFrame.
-    """
-    return (
-        df.dropna(subset=df.columns[3])
-        .iloc[:, 0]
-        .drop_duplicates()
-        .reset_index(drop=True)
-    )
-
-
 def parse_data(df: pd.DataFrame, unit_basis: Literal["SDR", "USD"]):
     """Parse the data from the IMF website"""
 
@@ -87,20 +84,26 @@ def parse_data(df: pd.DataFrame, unit_basis: Literal["SDR", "USD"]):
     else:
         raise ValueError("unit_basis must be either 'SDR' or 'USD'")
 
-    # Preprocess dataframe and extract relevant columns
     df = preprocess_data(df)
-    exchange_series = extract_exchange_series(df, col_val)
-    dates_series = extract_dates_series(df)
+
+    # the rate rows follow the currency rows for their report date, which are
+    # the only rows with an exchange rate, so carry each report date forward
+    dates = df["Report date"].where(df.iloc[:, 3].notna()).ffill()
+    is_rate = df["Report date"] == col_val
 
     return pd.DataFrame(
-        {"date": dates_series, "exchange_rate": exchange_series}
+        {
+            "date": dates[is_rate].to_numpy(),
+            "exchange_rate": df.loc[is_rate].iloc[:, 1].to_numpy(),
+        }
     ).assign(
         date=lambda d: pd.to_datetime(d.date),
         exchange_rate=lambda d: pd.to_numeric(d.exchange_rate, errors="coerce"),
     )
 
 
-@lru_cache
+@cached(TTLCache(maxsize=4, ttl=MEMORY_CACHE_TTL), lock=Lock(), info=True)
+@disk_cache(ttl=CACHE_TTL, tag="sdr")
 def fetch_exchange_rates(unit_basis: Literal["SDR", "USD"] = "SDR") -> pd.DataFrame:
     """Fetch the historic SDR exchange rates from the IMF
 
@@ -108,6 +111,9 @@ def fetch_exchange_rates(unit_basis: Literal["SDR", "USD"] = "SDR") -> pd.DataFr
 
     Read more at: https://www.imf.org/en/About/Factsheets/Sheets/2023/special-drawing-rights-sdr
 
+    Data is kept on disk for 1 day, and for up to 4 calls in memory for 1 hour. Calls are keyed on their
+    arguments as given, so `()`, `("SDR")` and `(unit_basis="SDR")` are cached separately.
+
     Args:
         unit_basis: The unit basis for the exchange rate. Default is "SDR" i.e. 1 SDR in USD. Other option is "USD" i.e. 1 USD in SDR
 
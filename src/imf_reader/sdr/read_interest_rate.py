@@ -3,15 +3,26 @@
 """
 
 import requests
+import urllib3
 import pandas as pd
-import io
-from functools import lru_cache
+from cachetools import cached, TTLCache
+from threading import Lock
 
 from imf_reader.config import logger
+from imf_reader.utils import (
+    disk_cache,
+    session,
+    REQUEST_TIMEOUT,
+    MEMORY_CACHE_TTL,
+    TSV_OPTIONS,
+)
 
 
 BASE_URL: str = "https://www.imf.org/external/np/fin/data/sdr_ir.aspx"
 
+# time in seconds before cached data is refetched
+CACHE_TTL = 7 * 24 * 60 * 60  # interest rates are published weekly
+
 
 def get_interest_rates_data():
     """Read the data from the IMF website"""
@@ -21,29 +32,36 @@ def get_interest_rates_data():
     }
 
     try:
-        response = requests.post(BASE_URL, data=data)
+        response = session.post(
+            BASE_URL, data=data, timeout=REQUEST_TIMEOUT, stream=True
+        )
         response.raise_for_status()
 
     except requests.exceptions.RequestException as e:
         raise ConnectionError(f"Could not connect to {BASE_URL}. Error: {str(e)}")
 
     try:
-        return pd.read_csv(
-            io.BytesIO(response.content), delimiter="/t", engine="python"
-        )
+        # decompress and parse the body as it streams in instead of buffering it
+        response.raw.decode_content = True
+
+        # the column headers are on the second line, after the title
+        return pd.read_csv(response.raw, header=1, **TSV_OPTIONS)
 
     except pd.errors.ParserError as e:
         raise ValueError(f"Could not parse data. Error: {str(e)}")
 
+    # the connection can fail while the body is being read
+    except (requests.exceptions.RequestException, urllib3.exceptions.HTTPError) as e:
+        raise ConnectionError(f"Could not connect to {BASE_URL}. Error: {str(e)}")
+
+    finally:
+        response.close()
+
 
 def preprocess_data(df: pd.DataFrame):
     """
-    Preprocess the input DataFrame by splitting columns and setting headers.
+    Preprocess the input DataFrame by renaming and selecting the date columns.
     """
-    df = df.iloc[:, 0].str.split("\t", expand=True)
-    df.columns = df.iloc[0]
-    df = df.iloc[1:]
-
     # Ensure required columns are present
     columns = {
         "Effective from": "effective_from",
@@ -105,7 +123,8 @@ def clean_data(df: pd.DataFrame) -> pd.DataFrame:
     )
 
 
-@lru_cache
+@cached(TTLCache(maxsize=1, ttl=MEMORY_CACHE_TTL), lock=Lock(), info=True)
+@disk_cache(ttl=CACHE_TTL, tag="sdr")
 def fetch_interest_rates() -> pd.DataFrame:
     """Fetch the historic SDR interest rates from the IMF
 
@@ -114,6 +133,8 @@ def fetch_interest_rates() -> pd.DataFrame:
     instrument of each component currency in the basket, and the exchange rate of each currency
     against the SDR. The SDR interest rate for the current week is released on Sunday morning, Washington D.C. time.
 
+    The data is kept on disk for 7 days, and in memory for 1 hour.
+
     returns:
         A DataFrame with the  historical SDR interest rates
     """
@@ -1,21 +1,101 @@
 """Utility functions"""
 
+import os
+import pickle
+import shutil
+import sqlite3
+from functools import wraps
+from pathlib import Path
+from tempfile import SpooledTemporaryFile
+from typing import BinaryIO
+
+import diskcache
 import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from platformdirs import user_cache_dir
+
+from imf_reader.config import logger
+
+# directory where data is cached on disk between sessions, which can be set with an
+# environment variable, e.g. where the user cache directory is not writable
+CACHE_DIR = Path(os.environ.get("IMF_READER_CACHE_DIR") or user_cache_dir("imf_reader"))
+
+# maximum size in bytes of the disk cache, above which the least recently stored entries are
+# evicted. It holds the SDMX zip file of each WEO version fetched and the SDR data
+CACHE_SIZE_LIMIT = 1024**3
+
+# errors raised when the disk cache can't be opened, read or written, e.g. when the cache
+# directory is not writable or an entry is truncated or corrupt
+CACHE_ERRORS = (OSError, sqlite3.Error, pickle.UnpicklingError, EOFError)
+
+# errors raised when an entry is read from the disk cache, which also include the errors
+# raised when unpickling an entry written under a different version of pandas, e.g.
+# "Can't get attribute" or a module that no longer exists
+CACHE_READ_ERRORS = (*CACHE_ERRORS, AttributeError, ImportError, TypeError)
+
+# time in seconds results cached on disk are also kept in memory. It is short compared to the
+# disk TTLs, so a result loaded from disk just before it expires is not reused for long after
+MEMORY_CACHE_TTL = 60 * 60
+
+# size in bytes above which streamed content which is not cached is written to disk
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+# options to read the tab separated files of the IMF website as strings with the C engine.
+# Selecting the columns with a callable drops the extra fields of rows wider than the header,
+# e.g. with a trailing tab, instead of raising, and index_col=False stops a wider first row
+# from being read as the index
+TSV_OPTIONS = {
+    "sep": "\t",
+    "dtype": str,
+    "usecols": lambda column: True,
+    "index_col": False,
+}
 
+# time in seconds to wait to connect to the IMF website, and for it to respond
+REQUEST_TIMEOUT = (5, 30)
 
-def make_request(url: str) -> requests.models.Response:
+# session shared by all requests so connections to the IMF website are reused.
+# Requests which fail with a temporary server error are retried with a backoff
+session = requests.Session()
+adapter = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504]),
+)
+session.mount("https://", adapter)
+session.mount("http://", adapter)
+session.headers.update({"Accept-Encoding": "gzip, deflate"})
+
+
+def _open_cache() -> diskcache.Cache:
+    """Open the disk cache in the cache directory, with its size limited to `CACHE_SIZE_LIMIT`."""
+    return diskcache.Cache(CACHE_DIR, size_limit=CACHE_SIZE_LIMIT)
+
+
+def make_request(
+    url: str, headers: dict | None = None, stream: bool = False
+) -> requests.models.Response:
     """Make a request to a url.
 
     Args:
         url: url to make request to
+        headers: additional headers to send with the request. If conditional headers are
+            sent, a 304 (Not Modified) response is also accepted
+        stream: whether to defer downloading the response content until it is read
 
     Returns:
         requests.models.Response: response object
     """
 
+    expected_status = (200, 304) if headers else (200,)
+
     try:
-        response = requests.get(url)
-        if response.status_code != 200:
+        response = session.get(
+            url, headers=headers, timeout=REQUEST_TIMEOUT, stream=stream
+        )
+        if response.status_code not in expected_status:
             raise ConnectionError(
                 f"Could not connect to {url}. Status code: {response.status_code}"
             )
@@ -24,3 +104,181 @@ def make_request(url: str) -> requests.models.Response:
 
     except requests.exceptions.RequestException as e:
         raise ConnectionError(f"Could not connect to {url}. Error: {str(e)}")
+
+
+def make_conditional_request(
+    url: str, tag: str, stream: bool = False
+) -> bytes | BinaryIO:
+    """Make a request to a url, reusing the content cached on disk if it has not changed.
+
+    The ETag and Last-Modified headers of the response are cached on disk with its content
+    and sent with the next request to the same url, so the content is only downloaded again
+    if the server reports it has changed. If the disk cache can't be read or written, a warning
+    is logged and the content is downloaded without it.
+
+    Args:
+        url: url to make request to
+        tag: tag used to group cached content so it can be cleared together
+        stream: whether to stream the content to disk and return a file object to read it,
+            instead of holding the whole content in memory
+
+    Returns:
+        The content of the response, or a file object to read it if `stream` is True
+    """
+
+    key = ("make_conditional_request", url)
+    content_key = (*key, "content")
+    try:
+        with _open_cache() as cache:
+            cached = cache.get(key) if content_key in cache else None
+    except CACHE_READ_ERRORS as e:
+        logger.warning(f"Could not read the disk cache. Error: {str(e)}")
+        cached = None
+
+    headers = {}
+    if cached is not None:
+        if cached["etag"]:
+            headers["If-None-Match"] = cached["etag"]
+        if cached["last_modified"]:
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    response = make_request(url, headers=headers, stream=stream)
+    try:
+        if response.status_code == 304:
+            try:
+                with _open_cache() as cache:
+                    content = cache.get(content_key, read=stream)
+            except CACHE_READ_ERRORS as e:
+                logger.warning(f"Could not read the disk cache. Error: {str(e)}")
+                content = None
+
+            if content is not None:
+                return content
+
+            # the cached content is no longer available, so download it again
+            response.close()
+            response = make_request(url, stream=stream)
+
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+
+        if not stream:
+            content = response.content
+        else:
+            response.raw.decode_content = True
+            content = response.raw
+
+        # content without validators can't be reused so it is not cached
+        if etag or last_modified:
+            try:
+                with _open_cache() as cache:
+                    cache.set(content_key, content, read=stream, tag=tag)
+                    cache.set(
+                        key, {"etag": etag, "last_modified": last_modified}, tag=tag
+                    )
+                    return cache.get(content_key, read=True) if stream else content
+            except CACHE_ERRORS as e:
+                # streamed content which was partly read before the error can't be recovered
+                if stream and content.tell():
+                    raise
+                logger.warning(f"Could not write to the disk cache. Error: {str(e)}")
+
+        if not stream:
+            return content
+        buffer = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+        shutil.copyfileobj(content, buffer)
+        buffer.seek(0)
+        return buffer
+
+    # the connection can fail while the streamed body is being read
+    except (requests.exceptions.RequestException, urllib3.exceptions.HTTPError) as e:
+        raise ConnectionError(f"Could not connect to {url}. Error: {str(e)}")
+
+    finally:
+        response.close()
+
+
+def clear_conditional_request(url: str) -> None:
+    """Clear the content and headers cached on disk by `make_conditional_request` for a url.
+
+    The content is downloaded again on the next request to the url, e.g. when the cached
+    content turns out to be corrupt.
+
+    Args:
+        url: url whose cached content to clear
+    """
+
+    key = ("make_conditional_request", url)
+    try:
+        with _open_cache() as cache:
+            cache.delete(key)
+            cache.delete((*key, "content"))
+    except CACHE_ERRORS as e:
+        logger.warning(f"Could not clear the disk cache. Error: {str(e)}")
+
+
+def disk_cache(ttl: float, tag: str):
+    """Cache the results of a function on disk so they persist between sessions.
+
+    Results are keyed by the function name and its arguments, and expire after `ttl` seconds.
+    If the disk cache can't be read or written, a warning is logged and the function is called.
+
+    Args:
+        ttl: time in seconds before a cached result expires
+        tag: tag used to group cached results so they can be cleared together
+
+    Returns:
+        The decorator to apply to the function
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (
+                func.__module__,
+                func.__qualname__,
+                args,
+                tuple(sorted(kwargs.items())),
+            )
+
+            # if the cache can't be used, fall back to calling the function
+            try:
+                with _open_cache() as cache:
+                    result = cache.get(key, default=diskcache.ENOVAL)
+            except CACHE_READ_ERRORS as e:
+                logger.warning(f"Could not read the disk cache. Error: {str(e)}")
+                result = diskcache.ENOVAL
+
+            if result is diskcache.ENOVAL:
+                result = func(*args, **kwargs)
+                try:
+                    with _open_cache() as cache:
+                        cache.set(key, result, expire=ttl, tag=tag)
+                except CACHE_ERRORS as e:
+                    logger.warning(
+                        f"Could not write to the disk cache. Error: {str(e)}"
+                    )
+
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def clear_disk_cache(tag: str) -> int:
+    """Clear the results cached on disk with a given tag.
+
+    Args:
+        tag: tag of the cached results to clear
+
+    Returns:
+        The number of cached results cleared
+    """
+
+    try:
+        with _open_cache() as cache:
+            return cache.evict(tag)
+    except CACHE_ERRORS as e:
+        logger.warning(f"Could not clear the disk cache. Error: {str(e)}")
+        return 0
@@ -1,7 +1,12 @@
 """Script to parse data from the IMF WEO website."""
 
+import hashlib
 import pandas as pd
-import xml.etree.ElementTree as ET
+from cachetools import cached, LRUCache
+from sys import intern
+from threading import Lock
+from lxml import etree
+from typing import IO
 from zipfile import ZipFile
 
 from imf_reader.config import UnexpectedFileError, logger
@@ -15,6 +20,9 @@ SDMX_FIELDS_TO_MAP = {
     "SCALE": "IMF.CL_WEO_SCALE.1.0",
 }
 
+# namespace of the elements in the xsd schema
+XSD_NAMESPACE = "{http://www.w3.org/2001/XMLSchema}"
+
 # numeric columns and the type to convert them to
 SDMX_NUMERIC_COLUMNS = {
     "OBS_VALUE": "Float64",
@@ -25,34 +33,130 @@ SDMX_NUMERIC_COLUMNS = {
 }
 
 
+def _schema_digest(schema: bytes) -> bytes:
+    """Key to cache the label lookups of a schema by, without keeping the schema itself."""
+    return hashlib.blake2b(schema, digest_size=8).digest()
+
+
 class SDMXParser:
     """Class to parse SDMX data
     To use this class, call the parse method with the folder containing the SDMX files.
     """
 
     @staticmethod
-    def parse_xml(tree: ET.ElementTree) -> pd.DataFrame:
-        """Parse the WEO XML tree and return a DataFrame with the data.
+    def parse_xml(
+        source: IO[bytes], label_lookups: dict[str, dict[str, str]] | None = None
+    ) -> pd.DataFrame:
+        """Parse the WEO XML data and return a DataFrame with the data.
+
+        The XML is streamed one series at a time and each series is discarded once read,
+        so the full tree is never held in memory.
 
         Args:
-            tree: The XML tree to parse.
+            source: The XML file to parse.
+            label_lookups: A dictionary with the label codes and label names for the series
+                attributes to label. The codes of these attributes are returned in a `_CODE`
+                column and their labels in a `_LABEL` column.
 
         Returns:
             A DataFrame with the data.
         """
 
-        rows = []  # List of dictionaries to store the data
-        root = tree.getroot()
-        for series in root[1]:  # Datasets are in the second element of the root
-            for obs in series:
-                rows.append({**series.attrib, **obs.attrib})
+        label_lookups = label_lookups or {}
+        columns: dict[str, list] = {}  # List of values for each column
+        n_rows = 0
+
+        # ids are not used and the whitespace between elements is not needed.
+        # huge_tree lifts libxml2's size limits for large releases
+        series_elements = etree.iterparse(
+            source,
+            events=("end",),
+            tag="{*}Series",
+            collect_ids=False,
+            remove_blank_text=True,
+            huge_tree=True,
+        )
+
+        def add_column(key: str, values: list) -> None:
+            """Add the values of an attribute for a series, with their labels if it is mapped."""
+            if key in label_lookups:
+                lookup = label_lookups[key]
+                columns.setdefault(f"{key}_LABEL", [None] * n_rows).extend(
+                    map(lookup.get, values)
+                )
+                key = f"{key}_CODE"
+            columns.setdefault(key, [None] * n_rows).extend(values)
+
+        for _, series in series_elements:
+            observations = [obs.attrib for obs in series]
+            n_obs = len(observations)
+
+            obs_keys = dict.fromkeys(key for obs in observations for key in obs)
+
+            # series attributes are repeated for every observation in the series, and
+            # interned so each code is stored once across series
+            for key, value in series.attrib.items():
+                value = intern(value)
+
+                # an observation attribute with the same name takes precedence
+                if key in obs_keys:
+                    add_column(key, [obs.get(key, value) for obs in observations])
+                else:
+                    add_column(key, [value] * n_obs)
+
+            for key in obs_keys:
+                if key not in series.attrib:
+                    add_column(key, [obs.get(key) for obs in observations])
+
+            # fill in columns which are missing from this series
+            n_rows += n_obs
+            for values in columns.values():
+                values.extend([None] * (n_rows - len(values)))
+
+            # free the series and the series already read
+            series.clear(keep_tail=False)
+            while series.getprevious() is not None:
+                del series.getparent()[0]
+
+        # move the label columns after the other columns
+        for key in label_lookups:
+            if f"{key}_LABEL" in columns:
+                columns[f"{key}_LABEL"] = columns.pop(f"{key}_LABEL")
 
         logger.debug("XML parsed successfully")
-        return pd.DataFrame(rows)
+        return pd.DataFrame(columns)
+
+    @staticmethod
+    def lookup_schema_elements(
+        schema_tree: etree._ElementTree, field_names
+    ) -> dict[str, dict[str, str]]:
+        """Lookup the elements in the schema and find the labels for several label_names.
+
+        The schema is walked once for all the labels.
+
+        Args:
+            schema_tree: The schema tree to search.
+            field_names: The labels to search for.
+
+        Returns:
+            A dictionary with a dictionary of label codes and label names for each label.
+        """
+
+        lookups = {field_name: {} for field_name in field_names}
+
+        for simple_type in schema_tree.iterfind(f"./{XSD_NAMESPACE}simpleType"):
+            field_name = simple_type.attrib.get("name")
+            if field_name in lookups:
+                lookups[field_name] = {
+                    elem.attrib["value"]: elem[0][0].text
+                    for elem in simple_type.iterfind("./*/*")
+                }
+
+        return lookups
 
     @staticmethod
     def lookup_schema_element(
-        schema_tree: ET.ElementTree, field_name
+        schema_tree: etree._ElementTree, field_name
     ) -> dict[str, str]:
         """Lookup the elements in the schema and find the label for a given label_name.
 
@@ -64,59 +168,71 @@ class SDMXParser:
             A dictionary with the label codes and label names.
         """
 
-        xpath_expr = f"./{{http://www.w3.org/2001/XMLSchema}}simpleType[@name='{field_name}']/*/*"
-        query = schema_tree.findall(xpath_expr)
-
-        # Loop through the query and create a dictionary
-        lookup_dict = {}
-        for elem in query:
-            lookup_dict[elem.attrib["value"]] = elem[0][0].text
-
-        return lookup_dict
+        return SDMXParser.lookup_schema_elements(schema_tree, [field_name])[field_name]
 
     @staticmethod
-    def add_label_columns(
-        data_df: pd.DataFrame, schema_tree: ET.ElementTree
-    ) -> pd.DataFrame:
-        """Maps columns with codes to columns with labels and renames the code columns.
+    @cached(LRUCache(maxsize=8), key=_schema_digest, lock=Lock())
+    def get_label_lookups(schema: bytes) -> dict[str, dict[str, str]]:
+        """Get the label codes and label names of the columns to map from the schema.
+
+        The lookups are cached by a digest of the schema content, so a schema which has
+        already been parsed, such as one shared by several versions, is not parsed again,
+        and the schema itself is not kept in memory.
 
         Args:
-            data_df: The DataFrame to add the label columns to.
-            schema_tree: The schema tree to search for the labels.
+            schema: The content of the xsd schema file.
 
         Returns:
-            The DataFrame with the label columns and renamed code columns.
+            A dictionary with the label codes and label names for each column to map.
         """
 
-        for column, lookup_name in SDMX_FIELDS_TO_MAP.items():
-            mapper = SDMXParser.lookup_schema_element(schema_tree, lookup_name)
-            data_df[f"{column}_LABEL"] = data_df[column].map(mapper)
-            data_df.rename(columns={column: f"{column}_CODE"}, inplace=True)
+        schema_tree = etree.ElementTree(
+            etree.fromstring(
+                schema,
+                etree.XMLParser(
+                    remove_comments=True, collect_ids=False, remove_blank_text=True
+                ),
+            )
+        )
+        lookups = SDMXParser.lookup_schema_elements(
+            schema_tree, SDMX_FIELDS_TO_MAP.values()
+        )
 
-        logger.debug(".xsd schema parsed and columns added successfully")
-        return data_df
+        logger.debug(".xsd schema parsed successfully")
+        return {
+            column: lookups[lookup_name]
+            for column, lookup_name in SDMX_FIELDS_TO_MAP.items()
+        }
 
     @staticmethod
-    def check_folder(sdmx_folder: ZipFile) -> None:
+    def check_folder(sdmx_folder: ZipFile) -> tuple[str, str]:
         """Check that the folder contains the necessary files.
 
         This method checks that there is only 1 xml and 1 xsd file in the folder.
 
         Args:
             sdmx_folder: The folder to check.
+
+        Returns:
+            The names of the xml and xsd files.
         """
 
-        if len([file for file in sdmx_folder.namelist() if file.endswith(".xml")]) != 1:
+        names = sdmx_folder.namelist()
+        xml_files = [file for file in names if file.endswith(".xml")]
+        xsd_files = [file for file in names if file.endswith(".xsd")]
+
+        if len(xml_files) != 1:
             raise UnexpectedFileError(
                 "There should be exactly one xml file in the folder"
             )
 
-        if len([file for file in sdmx_folder.namelist() if file.endswith(".xsd")]) != 1:
+        if len(xsd_files) != 1:
             raise UnexpectedFileError(
                 "There should be exactly one xsd file in the folder"
             )
 
         logger.debug("Zip folder check passed")
+        return xml_files[0], xsd_files[0]
 
     @staticmethod
     def clean_numeric_columns(df: pd.DataFrame) -> pd.DataFrame:
@@ -128,19 +244,20 @@ class SDMXParser:
 
         """
 
-        for column, dtype in SDMX_NUMERIC_COLUMNS.items():
-            df[column] = df[column].str.replace(",", "")  # Remove commas
-            df[column] = pd.to_numeric(
-                df[column], errors="coerce"
-            )  # Convert to numeric
-            df[column] = df[column].astype(dtype)
+        for column in SDMX_NUMERIC_COLUMNS:
+            values = df[column]
+
+            # Remove commas, only copying the column if there are any
+            if values.str.contains(",", regex=False, na=False).any():
+                values = values.str.replace(",", "", regex=False)
+
+            df[column] = pd.to_numeric(values, errors="coerce")  # Convert to numeric
 
-        # set type for the other columns to string
-        for column in df.columns:
-            if column not in SDMX_NUMERIC_COLUMNS.keys():
-                df[column] = df[column].astype("string")
+        # set the numeric types, and string type for the other columns, in one pass
+        dtypes = {column: "string" for column in df.columns}
+        dtypes.update(SDMX_NUMERIC_COLUMNS)
 
-        return df
+        return df.astype(dtypes)
 
     @staticmethod
     def parse(sdmx_folder: ZipFile) -> pd.DataFrame:
@@ -153,23 +270,16 @@ class SDMXParser:
             A DataFrame with the WEO data.
         """
 
-        SDMXParser.check_folder(sdmx_folder)
+        xml_name, xsd_name = SDMXParser.check_folder(sdmx_folder)
 
-        # Get the data and schema trees
-        data_tree = ET.parse(
-            sdmx_folder.open(
-                [file for file in sdmx_folder.namelist() if file.endswith(".xml")][0]
-            )
-        )
-        schema_tree = ET.parse(
-            sdmx_folder.open(
-                [file for file in sdmx_folder.namelist() if file.endswith(".xsd")][0]
-            )
-        )
+        # Get the labels from the schema
+        label_lookups = SDMXParser.get_label_lookups(sdmx_folder.read(xsd_name))
 
         # Parse and clean the data
-        data = SDMXParser.parse_xml(data_tree)  # Parse the xml data
-        data = SDMXParser.add_label_columns(data, schema_tree)  # add label columns
+        with sdmx_folder.open(xml_name) as data_file:
+            data = SDMXParser.parse_xml(
+                data_file, label_lookups
+            )  # parse data and labels
         data = SDMXParser.clean_numeric_columns(data)  # convert to numeric
 
         logger.debug("Data successfully parsed")
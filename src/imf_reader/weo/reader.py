@@ -1,17 +1,24 @@
 """Main interface to the WEO database."""
 
 from datetime import datetime
-from typing import Literal, Tuple, Optional
+from typing import Literal, Tuple, Optional, get_args
 import pandas as pd
 from functools import lru_cache
 
-from imf_reader.weo.scraper import SDMXScraper
+from imf_reader.weo.scraper import SDMXScraper, find_sdmx_url
 from imf_reader.weo.parser import SDMXParser
 from imf_reader.config import logger, NoDataError
+from imf_reader.utils import clear_disk_cache
 
 ValidMonths = Literal["April", "October"]  # Type hint for valid months
 Version = Tuple[ValidMonths, int]  # Type hint for version as a tuple of month and year
 
+# valid months keyed by their lower case name, to normalise the month case
+VALID_MONTHS = {month.lower(): month for month in get_args(ValidMonths)}
+
+# month of the previous version and the change in year for each version month
+PREVIOUS_VERSION_MONTH = {"October": ("April", 0), "April": ("October", -1)}
+
 
 def validate_version(version: Tuple) -> Version:
     """Validate the version
@@ -31,8 +38,9 @@ def validate_version(version: Tuple) -> Version:
         )
 
     # check that the month is either April or October
-    month = version[0].strip().capitalize()
-    if month not in ["April", "October"]:
+    try:
+        month = VALID_MONTHS[version[0].strip().lower()]
+    except KeyError:
         raise TypeError("Invalid month. Must be `April` or `October`")
 
     # check that the year is an integer. If it is not try to make it an integer
@@ -53,8 +61,8 @@ def gen_latest_version() -> Version:
         A tuple of the latest month and year
     """
 
-    current_year = datetime.now().year
-    current_month = datetime.now().month
+    now = datetime.now()
+    current_year, current_month = now.year, now.month
 
     # if month is less than 4 (April) return the version 2 (October) for the previous year
     if current_month < 4:
@@ -82,22 +90,23 @@ def roll_back_version(version: Version) -> Version:
         The rolled back version
     """
 
-    if version[0] == "October":
-        logger.debug(f"Rolling back version to April {version[1]}")
-        return "April", version[1]
-
-    elif version[0] == "April":
-        logger.debug(f"Rolling back version to October {version[1] - 1}")
-        return "October", version[1] - 1
-
-    else:
+    try:
+        month, year_change = PREVIOUS_VERSION_MONTH[version[0]]
+    except KeyError:
         raise ValueError(f"Invalid version: {version}")
 
+    year = version[1] + year_change
+    logger.debug(f"Rolling back version to {month} {year}")
+    return month, year
 
-@lru_cache
+
+@lru_cache(maxsize=8)
 def _fetch(version: Version) -> pd.DataFrame:
     """Helper function which handles caching and fetching the data from the IMF website
 
+    The data is cached in memory. Across sessions, the zip file of SDMX files is reused from disk
+    if the IMF website reports that it has not changed, and parsed again.
+
     Args:
         version: The version of the WEO data to fetch
 
@@ -105,8 +114,9 @@ def _fetch(version: Version) -> pd.DataFrame:
         A pandas DataFrame containing the WEO data
     """
 
-    folder = SDMXScraper.scrape(*version)  # scrape the data and get the SDMX files
-    df = SDMXParser.parse(folder)  # parse the SDMX files into a DataFrame
+    # scrape the data and get the SDMX files
+    with SDMXScraper.scrape(*version) as folder:
+        df = SDMXParser.parse(folder)  # parse the SDMX files into a DataFrame
     logger.info(f"Data fetched successfully for version: {version[0]} {version[1]}")
     return df
 
@@ -115,6 +125,8 @@ def clear_cache():
     """Clears the cache for any WEO data fetched by the `fetch_data` function."""
 
     _fetch.cache_clear()
+    find_sdmx_url.cache_clear()
+    clear_disk_cache("weo")
     logger.info("Cache cleared")
 
 
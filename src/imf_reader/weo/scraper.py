@@ -1,32 +1,104 @@
 """Functions to scrape the IMF WEO website"""
 
+import re
+import zlib
 import requests
-from bs4 import BeautifulSoup
-import io
+import lxml.html
+from lxml.etree import ParserError
+from cachetools import cached, TTLCache
+from html import unescape
+from threading import Lock
+from typing import BinaryIO
 from zipfile import ZipFile, BadZipFile
 
 from imf_reader.config import NoDataError, logger
-from imf_reader.utils import make_request
+from imf_reader.utils import (
+    make_request,
+    make_conditional_request,
+    clear_conditional_request,
+    disk_cache,
+    MEMORY_CACHE_TTL,
+)
 
 BASE_URL = "https://www.imf.org/"
 
+# time in seconds to keep the SDMX url found for a version
+SDMX_URL_CACHE_TTL = 24 * 60 * 60
 
-def get_soup(month: str, year: str | int) -> BeautifulSoup:
-    """Get the BeautifulSoup object of the IMF WEO website.
+# link to download the SDMX data on the IMF WEO website page
+SDMX_LINK_PATTERN = re.compile(
+    rb'<a\s[^>]*href="([^"]+)"[^>]*>\s*SDMX Data\s*</a>', re.I
+)
+
+
+class _ClosingZipFile(ZipFile):
+    """Zip file which also closes the file it is read from when it is closed.
+
+    ZipFile leaves file objects passed to it open, which would keep the file cached on disk
+    open after the zip file is closed. The CRC of each member is only checked as it is read,
+    so if a corrupt member is found while the zip file is open, the cached download is cleared.
+    """
+
+    def __init__(self, file: BinaryIO, url: str):
+        self._source = file
+        self.url = url
+        super().__init__(file)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None and issubclass(exc_type, (BadZipFile, zlib.error)):
+            logger.debug("Corrupt zip file. Clearing the cached download")
+            clear_conditional_request(self.url)
+        super().__exit__(exc_type, exc_value, traceback)
+
+    def close(self):
+        try:
+            super().close()
+        finally:
+            self._source.close()
+
+
+def get_page(month: str, year: str | int) -> bytes:
+    """Get the content of the IMF WEO website page to download the entire database.
 
     Args:
         month: The month of the data to download. Can be April or October.
         year: The year of the data to download.
 
     Returns:
-        BeautifulSoup object of the IMF WEO website.
+        The HTML content of the IMF WEO website page.
     """
 
     url = f"{BASE_URL}/en/Publications/WEO/weo-database/{year}/{month}/download-entire-database"
     response = make_request(url)
-    soup = BeautifulSoup(response.content, "html.parser")
 
-    return soup
+    return response.content
+
+
+@cached(TTLCache(maxsize=16, ttl=MEMORY_CACHE_TTL), lock=Lock(), info=True)
+@disk_cache(ttl=SDMX_URL_CACHE_TTL, tag="weo")
+def find_sdmx_url(month: str, year: str | int) -> str:
+    """Find the url to download the SDMX data for a version of the WEO.
+
+    The url is cached on disk for 1 day and in memory for 1 hour, so the IMF WEO website is
+    only scraped again for a version once the cache expires.
+
+    Args:
+        month: The month of the data to download. Can be April or October.
+        year: The year of the data to download.
+
+    Returns:
+        The url to download the SDMX data.
+    """
+
+    content = get_page(month, year)
+    match = SDMX_LINK_PATTERN.search(content)
+
+    if match is not None:
+        logger.debug("SDMX URL found")
+        return f"{BASE_URL}{unescape(match.group(1).decode())}"
+
+    # fall back to parsing the full page in case the markup has changed
+    return SDMXScraper.get_sdmx_url(content)
 
 
 class SDMXScraper:
@@ -35,44 +107,53 @@ class SDMXScraper:
     """
 
     @staticmethod
-    def get_sdmx_url(soup: BeautifulSoup) -> str:
+    def get_sdmx_url(content: bytes) -> str:
         """Get the url to download the WEO data in SDMX format.
 
         Args:
-            soup: BeautifulSoup object of the IMF WEO website.
+            content: HTML content of the IMF WEO website page.
 
         Returns:
             The url to download the SDMX data.
         """
 
         try:
-            href = soup.find("a", string="SDMX Data").get("href")
-        except AttributeError:
+            tree = lxml.html.fromstring(content)
+        except ParserError:
             raise NoDataError("SDMX data not found")
 
-        if href is None:
+        hrefs = tree.xpath("//a[normalize-space()='SDMX Data']/@href")
+        if not hrefs:
             raise NoDataError("SDMX data not found")
 
         logger.debug("SDMX URL found")
-        return f"{BASE_URL}{href}"
+        return f"{BASE_URL}{hrefs[0]}"
 
     @staticmethod
     def get_sdmx_folder(sdmx_url: str) -> ZipFile:
         """download SDMX data files as a zip file object
 
+        The zip file is cached on disk and only downloaded again if the IMF website reports
+        that it has changed, or if it is found to be corrupt. Only the central directory is
+        checked here, the CRC of each member is checked as it is read.
+
         Args:
             sdmx_url: The url to download the SDMX data files.
 
         Returns:
-            The zip file object containing the SDMX data files.
+            The zip file object containing the SDMX data files, which should be used as a
+            context manager so the download is cleared if a member is corrupt.
         """
 
-        response = make_request(sdmx_url)
-        folder = ZipFile(io.BytesIO(response.content))
-
-        # Validate the zip file
-        if folder.testzip():
-            raise BadZipFile("Corrupt zip file")
+        # stream the zip file to disk rather than holding it in memory
+        zip_file = make_conditional_request(sdmx_url, tag="weo", stream=True)
+        try:
+            folder = _ClosingZipFile(zip_file, sdmx_url)
+        except Exception as e:
+            zip_file.close()
+            if isinstance(e, BadZipFile):
+                clear_conditional_request(sdmx_url)
+            raise
 
         logger.debug("Zip folder downloaded successfully")
         return folder
@@ -86,14 +167,12 @@ class SDMXScraper:
             year: The year of the data to download.
 
         Returns:
-            The zip file object containing the SDMX data files.
+            The zip file object containing the SDMX data files, which should be used as a
+            context manager so the download is cleared if a member is corrupt.
         """
 
-        # Scrape the IMF WEO website
-        soup = get_soup(month, year)
-
         # find the url to download the SDMX data
-        sdmx_url = SDMXScraper.get_sdmx_url(soup)
+        sdmx_url = find_sdmx_url(month, year)
 
         # download the SDMX data files
         sdmx_folder = SDMXScraper.get_sdmx_folder(sdmx_url)
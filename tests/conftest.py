@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def disk_cache_dir(tmp_path, monkeypatch):
+    """Cache data on disk in a temporary directory for each test."""
+    monkeypatch.setattr("imf_reader.utils.CACHE_DIR", tmp_path / "cache")
@@ -0,0 +1,82 @@
+import io
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+from imf_reader import sdr
+
+
+class FakeResponse:
+    """Minimal stand-in for a streamed requests response."""
+
+    __slots__ = ("raw", "closed")
+
+    def __init__(self, content: bytes):
+        self.raw = io.BytesIO(content)
+        self.closed = False
+
+    def raise_for_status(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def mock_post(monkeypatch):
+    """Replace the post method of the shared session with a mock."""
+    mock = MagicMock()
+    monkeypatch.setattr("imf_reader.utils.session.post", mock)
+    return mock
+
+
+@pytest.fixture(scope="session")
+def fake_response():
+    """Build a fake streamed response with the given content."""
+    return FakeResponse
+
+
+@pytest.fixture
+def clear_cache():
+    """Clear the cached SDR data, for tests which fetch it."""
+    sdr.clear_cache()
+
+
+@pytest.fixture(scope="session")
+def tsv_bytes():
+    """Valid TSV content of the SDR data, with a title line above the headers."""
+    return b"Title\nColumn1\tColumn2\n2023-11-30\t1.234\n2023-12-01\t0.789\n"
+
+
+@pytest.fixture(scope="session")
+def tsv_df():
+    """Data read from `tsv_bytes`, shared by all tests which must not modify it."""
+    return pd.DataFrame(
+        {"Column1": ["2023-11-30", "2023-12-01"], "Column2": ["1.234", "0.789"]}
+    )
+
+
+@pytest.fixture(scope="module")
+def expected_preprocessed_ir():
+    """Interest rate data expected after preprocessing, which tests must not modify."""
+    return pd.DataFrame(
+        {
+            "effective_from": [
+                "01/12/2024",
+                "SDR Interest Rate",
+                "06/12/2024",
+                "Total",
+                "09/12/2024",
+                "Floor for SDR Interest Rate",
+            ],
+            "effective_to": [
+                "05/12/2024",
+                "1.50",
+                "08/12/2024",
+                "2.75",
+                "12/12/2024",
+                "3.50",
+            ],
+        }
+    )
@@ -0,0 +1,25 @@
+from unittest.mock import patch
+import pandas as pd
+from imf_reader import sdr
+from imf_reader.sdr.read_interest_rate import fetch_interest_rates
+
+
+@patch("imf_reader.sdr.read_interest_rate.clean_data")
+@patch("imf_reader.sdr.read_interest_rate.get_interest_rates_data")
+def test_clear_cache(mock_get_data, mock_clean_data):
+    """Test clear_cache only reports clearing when data was cached."""
+    mock_clean_data.return_value = pd.DataFrame({"interest_rate": [1.5]})
+    sdr.clear_cache()
+
+    with patch("imf_reader.sdr.clear_cache.logger.info") as mock_logger:
+        sdr.clear_cache()
+        mock_logger.assert_called_once_with("No cached data to clear")
+
+    fetch_interest_rates()
+    assert fetch_interest_rates.cache_info().currsize == 1
+
+    with patch("imf_reader.sdr.clear_cache.logger.info") as mock_logger:
+        sdr.clear_cache()
+        mock_logger.assert_called_once_with("Cache cleared")
+
+    assert fetch_interest_rates.cache_info().currsize == 0
@@ -0,0 +1,103 @@
+import re
+from unittest.mock import patch, ANY
+import pytest
+import requests
+import urllib3
+import pandas as pd
+from imf_reader.sdr import read_exchange_rate, read_interest_rate
+from imf_reader.utils import REQUEST_TIMEOUT, TSV_OPTIONS
+
+# errors raised by the mocked request and parser, shared by the parametrized cases
+NETWORK_ERROR = requests.exceptions.RequestException("Network error")
+PARSER_ERROR = pd.errors.ParserError("Parsing error")
+READ_ERROR = urllib3.exceptions.ProtocolError("Connection broken")
+
+# error message raised when the data cannot be parsed
+PARSE_ERROR_MESSAGE = re.compile("Could not parse data")
+
+# error messages raised when the connection to each url fails
+CONNECTION_ERROR_MESSAGES = {
+    url: re.compile(f"Could not connect to {re.escape(url)}")
+    for url in (read_exchange_rate.BASE_URL, read_interest_rate.BASE_URL)
+}
+
+# functions which read the TSV data from the IMF website, with the url they post to
+TSV_READERS = pytest.mark.parametrize(
+    "get_data, url",
+    [
+        (read_exchange_rate.get_exchange_rates_data, read_exchange_rate.BASE_URL),
+        (read_interest_rate.get_interest_rates_data, read_interest_rate.BASE_URL),
+    ],
+    ids=["exchange_rate", "interest_rate"],
+)
+
+
+@TSV_READERS
+def test_get_data_connection_error(mock_post, get_data, url):
+    """Test ConnectionError is raised when the post request fails."""
+    # Simulate raising a requests.exceptions.RequestException
+    mock_post.side_effect = NETWORK_ERROR
+
+    # Verify the exception
+    with pytest.raises(ConnectionError, match=CONNECTION_ERROR_MESSAGES[url]):
+        get_data()
+
+    # Verify the mock was called with the expected arguments
+    mock_post.assert_called_once_with(
+        url,
+        data={"__EVENTTARGET": "lbnTSV"},
+        timeout=REQUEST_TIMEOUT,
+        stream=True,
+    )
+
+
+@TSV_READERS
+def test_get_data_parse_error(mock_post, fake_response, get_data, url):
+    """Test ValueError is raised when parsing fails."""
+    with patch("pandas.read_csv") as mock_read_csv:
+        # Mock the response content with invalid data
+        mock_response = fake_response(b"invalid data")
+        mock_post.return_value = mock_response
+
+        # Simulate pd.read_csv raising a ParserError
+        mock_read_csv.side_effect = PARSER_ERROR
+
+        # Use pytest.raises to assert the ValueError
+        with pytest.raises(ValueError, match=PARSE_ERROR_MESSAGE):
+            get_data()
+
+        # Assertions
+        assert mock_response.closed
+        mock_post.assert_called_once_with(
+            url,
+            data={"__EVENTTARGET": "lbnTSV"},
+            timeout=REQUEST_TIMEOUT,
+            stream=True,
+        )
+        mock_read_csv.assert_called_once_with(ANY, header=1, **TSV_OPTIONS)
+
+
+@TSV_READERS
+def test_get_data_read_error(mock_post, fake_response, get_data, url):
+    """Test ConnectionError is raised when the connection fails while reading the data."""
+    with patch("pandas.read_csv") as mock_read_csv:
+        mock_response = fake_response(b"Title\nColumn1")
+        mock_post.return_value = mock_response
+
+        # Simulate the connection breaking while the body is streamed
+        mock_read_csv.side_effect = READ_ERROR
+
+        with pytest.raises(ConnectionError, match=CONNECTION_ERROR_MESSAGES[url]):
+            get_data()
+
+        assert mock_response.closed
+
+
+@TSV_READERS
+def test_get_data_wide_rows(mock_post, fake_response, get_data, url, tsv_df):
+    """Test the extra fields of rows wider than the header, e.g. with a trailing tab, are dropped."""
+    mock_post.return_value = fake_response(
+        b"Title\nColumn1\tColumn2\n2023-11-30\t1.234\t\n2023-12-01\t0.789\t\t\n"
+    )
+
+    pd.testing.assert_frame_equal(get_data(), tsv_df)
@@ -0,0 +1,22 @@
+from unittest.mock import patch
+import pandas as pd
+from imf_reader import sdr
+
+
+@patch("imf_reader.sdr.fetch_all.fetch_interest_rates")
+@patch("imf_reader.sdr.fetch_all.fetch_exchange_rates")
+@patch("imf_reader.sdr.fetch_all.fetch_allocations_holdings")
+def test_fetch_all(mock_holdings, mock_exchange_rates, mock_interest_rates):
+    """Test fetch_all returns the three datasets keyed by name."""
+    mock_holdings.return_value = pd.DataFrame({"value": [1]})
+    mock_exchange_rates.return_value = pd.DataFrame({"exchange_rate": [2]})
+    mock_interest_rates.return_value = pd.DataFrame({"interest_rate": [3]})
+
+    result = sdr.fetch_all((2024, 2), "USD")
+
+    mock_holdings.assert_called_once_with((2024, 2))
+    mock_exchange_rates.assert_called_once_with("USD")
+    mock_interest_rates.assert_called_once_with()
+    assert result["allocations_holdings"] is mock_holdings.return_value
+    assert result["exchange_rates"] is mock_exchange_rates.return_value
+    assert result["interest_rates"] is mock_interest_rates.return_value
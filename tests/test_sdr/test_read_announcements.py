@@ -9,6 +9,7 @@ from imf_reader.sdr.read_announcements import (
     get_holdings_and_allocations_data,
     get_latest_date,
     fetch_allocations_holdings,
+    fetch_allocations_holdings_range,
     BASE_URL,
     MAIN_PAGE_URL,
 )
@@ -18,13 +19,9 @@ from imf_reader.sdr.read_announcements import (
 def input_df():
     df = pd.DataFrame(
         {
-            "SDR Allocations and Holdings": [
-                "for all members as of June 30, 2020",
-                "(in SDRs)",
-                "Members\tSDR Holdings\tSDR Allocations",
-                "Spain\t123\t456",
-                "Total\t321\t654",
-            ]
+            "Members": ["Spain", "Total"],
+            "SDR Holdings": ["123", "321"],
+            "SDR Allocations": ["456", "654"],
         }
     )
     return df
@@ -38,21 +35,57 @@ class TestReadAnnouncements:
         """Clear cache before each test."""
         sdr.clear_cache()
 
+    @patch("imf_reader.sdr.read_announcements.make_conditional_request")
     @patch("pandas.read_csv")
-    def test_read_tsv_success(self, mock_read_csv):
+    def test_read_tsv_success(self, mock_read_csv, mock_make_request):
         """Test read_tsv successfully processes a well-formatted TSV."""
-        mock_read_csv.return_value = pd.DataFrame({"A": [1], "B": [2]})
+        mock_make_request.return_value = b"A\tB\tC\n1\t2\t3"
+        mock_read_csv.return_value = pd.DataFrame({"A": [1], "B": [2], "C": [3]})
         result = read_tsv("mock_url")
+        mock_make_request.assert_called_once_with("mock_url", tag="sdr")
         assert isinstance(result, pd.DataFrame)
-        assert result.equals(pd.DataFrame({"A": [1], "B": [2]}))
+        assert result.equals(pd.DataFrame({"A": [1], "B": [2], "C": [3]}))
+
+    @patch("imf_reader.sdr.read_announcements.make_conditional_request")
+    def test_read_tsv_reads_header(self, mock_make_request):
+        """Test read_tsv uses the fourth line as the header."""
+        mock_make_request.return_value = (
+            b"SDR Allocations and Holdings\n"
+            b"for all members as of June 30, 2020\n"
+            b"(in SDRs)\n"
+            b"Members\tSDR Holdings\tSDR Allocations\n"
+            b"Spain\t123\t456\n"
+        )
+        result = read_tsv("mock_url")
+        expected_df = pd.DataFrame(
+            {"Members": ["Spain"], "SDR Holdings": ["123"], "SDR Allocations": ["456"]}
+        )
+        pd.testing.assert_frame_equal(result, expected_df)
 
+    @patch("imf_reader.sdr.read_announcements.make_conditional_request")
     @patch("pandas.read_csv")
-    def test_read_tsv_failure(self, mock_read_csv):
+    def test_read_tsv_failure(self, mock_read_csv, mock_make_request):
         """Test read_tsv raises ValueError on malformed data."""
+        mock_make_request.return_value = b"invalid data"
         mock_read_csv.side_effect = pd.errors.ParserError
         with pytest.raises(ValueError, match="SDR _data not available for this date"):
             read_tsv("mock_url")
 
+    @pytest.mark.parametrize(
+        "content",
+        [
+            b"",
+            b"<html>\n<head>\n<title>Error</title>\n</head>\n<body>Error</body>\n</html>\n",
+        ],
+        ids=["empty", "html"],
+    )
+    @patch("imf_reader.sdr.read_announcements.make_conditional_request")
+    def test_read_tsv_not_tsv(self, mock_make_request, content):
+        """Test read_tsv raises ValueError when the content is not the TSV data."""
+        mock_make_request.return_value = content
+        with pytest.raises(ValueError, match="SDR _data not available for this date"):
+            read_tsv("mock_url")
+
     def test_clean_df_correct_format(self, input_df):
         """Test clean_df with the expected format."""
         # Mock input DataFrame
@@ -63,7 +96,7 @@ class TestReadAnnouncements:
                 "indicator": ["holdings", "holdings", "allocations", "allocations"],
                 "value": [123, 321, 456, 654],
             }
-        )
+        ).astype({"entity": "category", "indicator": "category"})
 
         result = clean_df(input_df)
         pd.testing.assert_frame_equal(result, expected_df)
@@ -109,7 +142,7 @@ class TestReadAnnouncements:
                 "value": [123, 321, 456, 654],
                 "date": [pd.to_datetime("2024-02-29")] * 4,
             }
-        )
+        ).astype({"entity": "category", "indicator": "category"})
 
         # Call the function
         result = get_holdings_and_allocations_data(2024, 2)
@@ -135,7 +168,7 @@ class TestReadAnnouncements:
         """Test get_latest_date successfully returns the latest date."""
 
         # Mock HTML content
-        mock_html_content = """
+        mock_html_content = b"""
         <html>
             <body>
                 <table>
@@ -165,17 +198,76 @@ class TestReadAnnouncements:
         mock_make_request.assert_called_once_with(MAIN_PAGE_URL)
         assert result == (2023, 11)  # Expected year and month
 
+    @patch("imf_reader.sdr.read_announcements.make_request")
+    def test_get_latest_date_fallback(self, mock_make_request):
+        """Test get_latest_date parses the page when the date pattern does not match."""
+
+        # Mock HTML content with the date split across lines
+        mock_response = Mock()
+        mock_response.content = (
+            b"<html><body><table></table><table></table><table></table><table></table>"
+            b"<table><tr></tr><tr><td>November\n 30, 2023</td></tr></table></body></html>"
+        )
+        mock_make_request.return_value = mock_response
+
+        # Call the function
+        result = get_latest_date()
+
+        # Assertions
+        assert result == (2023, 11)
+
+    @patch("imf_reader.sdr.read_announcements.make_request")
+    def test_get_latest_date_nested_markup(self, mock_make_request):
+        """Test get_latest_date reads a date nested in markup within the cell."""
+
+        mock_response = Mock()
+        mock_response.content = (
+            b"<html><body>" + b"<table></table>" * 4 + b"<table><tr></tr>"
+            b"<tr><td><b>November 30, 2023</b></td></tr></table></body></html>"
+        )
+        mock_make_request.return_value = mock_response
+
+        assert get_latest_date() == (2023, 11)
+
+    @patch("imf_reader.sdr.read_announcements.make_request")
+    def test_get_latest_date_not_a_date(self, mock_make_request):
+        """Test get_latest_date only reads the date from the second row of the fifth table."""
+
+        # the cell holds no date, but the next table does
+        mock_response = Mock()
+        mock_response.content = (
+            b"<html><body>" + b"<table></table>" * 4 + b"<table><tr></tr>"
+            b"<tr><td>Total</td></tr></table>"
+            b"<table><tr></tr><tr><td>March 31, 2020</td></tr></table></body></html>"
+        )
+        mock_make_request.return_value = mock_response
+
+        with pytest.raises(ValueError):
+            get_latest_date()
+
+    @patch("imf_reader.sdr.read_announcements.make_request")
+    def test_get_latest_date_large_page(self, mock_make_request):
+        """Test get_latest_date falls back quickly on a large page without the date."""
+
+        # many tables with many rows, none of which hold a date
+        table = b"<table>" + b"<tr><td>Total</td><td>1,234</td></tr>" * 50 + b"</table>"
+        mock_response = Mock()
+        mock_response.content = b"<html><body>" + table * 16 + b"</body></html>"
+        mock_make_request.return_value = mock_response
+
+        with pytest.raises(ValueError):
+            get_latest_date()
+
     @patch("imf_reader.sdr.read_announcements.make_request")
     def test_get_latest_date_invalid_html(self, mock_make_request):
         """Test get_latest_date raises an error when HTML parsing fails."""
 
         # Mock malformed HTML content
         mock_response = Mock()
-        mock_response.content = "<html><body></body></html>"  # Missing tables
+        mock_response.content = b"<html><body></body></html>"  # Missing tables
         mock_make_request.return_value = mock_response
 
-        # Call the function and expect an IndexError
-        with pytest.raises(IndexError):
+        with pytest.raises(ValueError, match="Could not find the latest date"):
             get_latest_date()
 
     @patch("imf_reader.sdr.read_announcements.get_latest_date")
@@ -238,3 +330,31 @@ class TestReadAnnouncements:
         # Assertions
         with pytest.raises(ValueError, match="Data not available"):
             fetch_allocations_holdings()
+
+    @patch("imf_reader.sdr.read_announcements.get_holdings_and_allocations_data")
+    def test_fetch_allocations_holdings_range(self, mock_get_holdings_data):
+        """Test fetch_allocations_holdings_range fetches and combines every month in the range."""
+        mock_get_holdings_data.side_effect = lambda year, month: pd.DataFrame(
+            {
+                "entity": ["Spain"],
+                "indicator": ["holdings"],
+                "date": [f"{year}-{month}"],
+            }
+        ).astype({"entity": "category", "indicator": "category"})
+
+        result = fetch_allocations_holdings_range((2023, 11), (2024, 2))
+
+        expected_df = pd.DataFrame(
+            {
+                "entity": ["Spain"] * 4,
+                "indicator": ["holdings"] * 4,
+                "date": ["2023-11", "2023-12", "2024-1", "2024-2"],
+            }
+        ).astype({"entity": "category", "indicator": "category"})
+        pd.testing.assert_frame_equal(result, expected_df)
+        assert mock_get_holdings_data.call_count == 4
+
+    def test_fetch_allocations_holdings_range_invalid(self):
+        """Test fetch_allocations_holdings_range raises ValueError when start is after end."""
+        with pytest.raises(ValueError, match="start date must be before"):
+            fetch_allocations_holdings_range((2024, 2), (2023, 11))
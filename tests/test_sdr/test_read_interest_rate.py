@@ -1,8 +1,6 @@
 import pytest
 import pandas as pd
-import requests
-from unittest.mock import patch, MagicMock, ANY
-from imf_reader import sdr
+from unittest.mock import patch
 from imf_reader.sdr.read_interest_rate import (
     BASE_URL,
     get_interest_rates_data,
@@ -12,145 +10,90 @@ from imf_reader.sdr.read_interest_rate import (
     clean_data,
     fetch_interest_rates,
 )
+from imf_reader.utils import REQUEST_TIMEOUT
 
+# dates of the first interest rate in the input data
+EFFECTIVE_FROM = pd.Timestamp("01/12/2024")
+EFFECTIVE_TO = pd.Timestamp("05/12/2024")
 
-@pytest.fixture
+
+@pytest.fixture(scope="module")
 def input_df():
+    """Raw data shared by the tests in this module, which must not modify it."""
     df = pd.DataFrame(
         {
-            "SDR Interest Rate Calculation": [
-                "Effective from\tEffective to\tCurrency Unit\tCurrency amount\tExchange rate",
-                "01/12/2024\t05/12/2024\tN/A\tN/A",
-                "SDR Interest Rate\t1.50",
-                "06/12/2024\t08/12/2024\tN/A\tN/A",
-                "Total\t2.75",
-                "09/12/2024\t12/12/2024\tN/A\tN/A",
-                "Floor for SDR Interest Rate\t3.50",
+            "Effective from": [
+                "01/12/2024",
+                "SDR Interest Rate",
+                "06/12/2024",
+                "Total",
+                "09/12/2024",
+                "Floor for SDR Interest Rate",
                 "empty row",
-            ]
+            ],
+            "Effective to": [
+                "05/12/2024",
+                "1.50",
+                "08/12/2024",
+                "2.75",
+                "12/12/2024",
+                "3.50",
+                None,
+            ],
+            "Currency Unit": [None] * 7,
+            "Currency amount": [None] * 7,
+            "Exchange rate": [None] * 7,
         }
     )
     return df
 
 
-class TestReadInterestRate:
+@pytest.fixture(scope="module")
+def preprocessed_df(input_df):
+    """Preprocessed data shared by the tests in this module, which must not modify it."""
+    return preprocess_data(input_df)
 
-    @pytest.fixture(autouse=True)
-    def auto_clear_cache(self):
-        """Clear cache before each test."""
-        sdr.clear_cache()
 
-    @patch("requests.post")
-    def test_get_interest_rates_data(self, mock_post):
+class TestReadInterestRate:
+
+    def test_get_interest_rates_data(self, mock_post, fake_response, tsv_bytes, tsv_df):
         """Test successful data retrieval and parsing"""
         # Mock the response content with a valid TSV format
-        mock_response = MagicMock()
-        mock_response.content = (
-            b"Column1\tColumn2\n2023-11-30\t1.234\n2023-12-01\t0.789\n"
-        )
-        mock_response.raise_for_status = MagicMock()
+        mock_response = fake_response(tsv_bytes)
         mock_post.return_value = mock_response
 
-        expected_df = pd.DataFrame(
-            {"Column1\tColumn2": ["2023-11-30\t1.234", "2023-12-01\t0.789"]}
-        )
         result = get_interest_rates_data()
 
         # Assertions
-        pd.testing.assert_frame_equal(result, expected_df)
-        mock_post.assert_called_once_with(BASE_URL, data={"__EVENTTARGET": "lbnTSV"})
-
-    def test_get_interest_rates_data_connection_error(self):
-        """Test ConnectionError is raised when requests.post fails."""
-        with patch("requests.post") as mock_post:
-            # Simulate raising a requests.exceptions.RequestException
-            mock_post.side_effect = requests.exceptions.RequestException(
-                "Network error"
-            )
-
-            # Verify the exception
-            with pytest.raises(
-                ConnectionError,
-                match=f"Could not connect to {BASE_URL}",
-            ):
-                get_interest_rates_data()
-
-            # Verify the mock was called with the expected arguments
-            mock_post.assert_called_once_with(
-                BASE_URL, data={"__EVENTTARGET": "lbnTSV"}
-            )
-
-    def test_get_interest_rates_data_parse_error(self):
-        """Test ValueError is raised when parsing fails."""
-        with patch("requests.post") as mock_post, patch(
-            "pandas.read_csv"
-        ) as mock_read_csv:
-            # Mock the response content with invalid data
-            mock_response = MagicMock()
-            mock_response.content = b"invalid data"
-            mock_response.raise_for_status = MagicMock()
-            mock_post.return_value = mock_response
-
-            # Simulate pd.read_csv raising a ParserError
-            mock_read_csv.side_effect = pd.errors.ParserError("Parsing error")
-
-            # Use pytest.raises to assert the ValueError
-            with pytest.raises(ValueError, match="Could not parse data"):
-                get_interest_rates_data()
-
-            # Assertions
-            mock_post.assert_called_once_with(
-                BASE_URL, data={"__EVENTTARGET": "lbnTSV"}
-            )
-            mock_read_csv.assert_called_once_with(ANY, delimiter="/t", engine="python")
+        pd.testing.assert_frame_equal(result, tsv_df)
+        assert mock_response.closed
+        mock_post.assert_called_once_with(
+            BASE_URL,
+            data={"__EVENTTARGET": "lbnTSV"},
+            timeout=REQUEST_TIMEOUT,
+            stream=True,
+        )
 
-    def test_preprocess_data_success(self, input_df):
+    def test_preprocess_data_success(self, input_df, expected_preprocessed_ir):
         """Test preprocess_data function with valid input."""
-        expected_df = pd.DataFrame(
-            {
-                "effective_from": [
-                    "01/12/2024",
-                    "SDR Interest Rate",
-                    "06/12/2024",
-                    "Total",
-                    "09/12/2024",
-                    "Floor for SDR Interest Rate",
-                ],
-                "effective_to": [
-                    "05/12/2024",
-                    "1.50",
-                    "08/12/2024",
-                    "2.75",
-                    "12/12/2024",
-                    "3.50",
-                ],
-            }
-        )
-        expected_df.columns.name = 0
         result = preprocess_data(input_df).reset_index(drop=True)
 
         # Validate the structure and content of the DataFrame
-        pd.testing.assert_frame_equal(result, expected_df)
+        pd.testing.assert_frame_equal(result, expected_preprocessed_ir)
 
     def test_preprocess_data_missing_column(self):
         """Test preprocess_data function raises KeyError when required columns are missing."""
         invalid_df = pd.DataFrame(
-            {
-                "SDR Interest Rate Calculation": [
-                    "Some column\tAnother column",
-                    "01/12/2024\tN/A",
-                ]
-            }
+            {"Some column": ["01/12/2024"], "Another column": [None]}
         )
 
         with pytest.raises(KeyError, match="Missing required column: Effective from"):
             preprocess_data(invalid_df)
 
-    def test_filter_data_valid(self, input_df):
+    def test_filter_data_valid(self, preprocessed_df):
         """Test _filter_data with a valid DataFrame."""
 
-        input_df = preprocess_data(input_df)
-        result = _filter_data(input_df)
+        result = _filter_data(preprocessed_df)
 
         # Expected Output DataFrame
         expected_df = pd.DataFrame(
@@ -164,12 +107,11 @@ class TestReadInterestRate:
                 "effective_to": ["05/12/2024", "1.50", "08/12/2024", "12/12/2024"],
             }
         )
-        expected_df.columns.name = 0
 
         # Validate the results
         pd.testing.assert_frame_equal(result, expected_df)
 
-    def test_format_data_valid(self, input_df):
+    def test_format_data_valid(self, preprocessed_df):
         """Test _format_data with valid input."""
         expected_df = pd.DataFrame(
             {
@@ -180,10 +122,7 @@ class TestReadInterestRate:
         )
 
         result = (
-            preprocess_data(input_df)
-            .pipe(_filter_data)
-            .pipe(_format_data)
-            .reset_index(drop=True)
+            preprocessed_df.pipe(_filter_data).pipe(_format_data).reset_index(drop=True)
         )
 
         # Validate the structure and content of the DataFrame
@@ -195,10 +134,10 @@ class TestReadInterestRate:
             {
                 "interest_rate": [1.50],
                 "effective_from": [
-                    pd.Timestamp("01/12/2024"),
+                    EFFECTIVE_FROM,
                 ],
                 "effective_to": [
-                    pd.Timestamp("05/12/2024"),
+                    EFFECTIVE_TO,
                 ],
             }
         )
@@ -208,6 +147,7 @@ class TestReadInterestRate:
         # Validate the structure and content of the resulting DataFrame
         pd.testing.assert_frame_equal(result, expected_df)
 
+    @pytest.mark.usefixtures("clear_cache")
     @patch("imf_reader.sdr.read_interest_rate.get_interest_rates_data")
     @patch("imf_reader.sdr.read_interest_rate.clean_data")
     def test_fetch_exchange_rates(self, mock_clean_data, mock_get_data, input_df):
@@ -219,10 +159,10 @@ class TestReadInterestRate:
             {
                 "interest_rate": [1.50],
                 "effective_from": [
-                    pd.Timestamp("01/12/2024"),
+                    EFFECTIVE_FROM,
                 ],
                 "effective_to": [
-                    pd.Timestamp("05/12/2024"),
+                    EFFECTIVE_TO,
                 ],
             }
         )
@@ -231,10 +171,10 @@ class TestReadInterestRate:
             {
                 "interest_rate": [1.50],
                 "effective_from": [
-                    pd.Timestamp("01/12/2024"),
+                    EFFECTIVE_FROM,
                 ],
                 "effective_to": [
-                    pd.Timestamp("05/12/2024"),
+                    EFFECTIVE_TO,
                 ],
             }
         )
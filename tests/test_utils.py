@@ -0,0 +1,202 @@
+"""Tests for utils module."""
+
+import io
+import pickle
+from unittest.mock import Mock, patch
+
+import diskcache
+import pytest
+import urllib3
+
+from imf_reader.utils import (
+    disk_cache,
+    clear_disk_cache,
+    clear_conditional_request,
+    make_conditional_request,
+    session,
+    CACHE_SIZE_LIMIT,
+)
+
+
+@pytest.fixture
+def mock_func():
+    """Mock function with the names disk_cache uses to key its results."""
+    mock = Mock(return_value=[1, 2, 3])
+    mock.__name__ = "mock_func"
+    mock.__qualname__ = "mock_func"
+    return mock
+
+
+def test_session_retries():
+    """Test the session retries temporary server errors."""
+
+    retries = session.get_adapter("https://www.imf.org").max_retries
+    assert retries.total == 3
+    assert set(retries.status_forcelist) == {502, 503, 504}
+
+
+def test_disk_cache(mock_func):
+    """Test disk_cache stores results on disk and clear_disk_cache removes them."""
+
+    cached_func = disk_cache(ttl=60, tag="test")(mock_func)
+
+    # the function is only called once for the same arguments
+    assert cached_func(1) == [1, 2, 3]
+    assert cached_func(1) == [1, 2, 3]
+    mock_func.assert_called_once_with(1)
+
+    # different arguments are cached separately
+    cached_func(2)
+    assert mock_func.call_count == 2
+
+    # clearing the cache calls the function again
+    clear_disk_cache("test")
+    cached_func(1)
+    assert mock_func.call_count == 3
+
+
+def test_disk_cache_size_limit(mock_func, tmp_path):
+    """Test the disk cache is opened with its size limit."""
+
+    disk_cache(ttl=60, tag="test")(mock_func)(1)
+
+    with diskcache.Cache(tmp_path / "cache") as cache:
+        assert cache.size_limit == CACHE_SIZE_LIMIT
+
+
+def test_disk_cache_unavailable(mock_func, tmp_path, monkeypatch):
+    """Test disk_cache calls the function when the cache directory can't be created."""
+
+    # the cache directory can't be created inside a file
+    (tmp_path / "file").touch()
+    monkeypatch.setattr("imf_reader.utils.CACHE_DIR", tmp_path / "file" / "cache")
+
+    cached_func = disk_cache(ttl=60, tag="test")(mock_func)
+
+    assert cached_func(1) == [1, 2, 3]
+    assert cached_func(1) == [1, 2, 3]
+    assert mock_func.call_count == 2
+    assert clear_disk_cache("test") == 0
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        pickle.UnpicklingError,
+        AttributeError("Can't get attribute 'Block'"),
+        ModuleNotFoundError("No module named 'pandas.core.indexes.numeric'"),
+    ],
+)
+def test_disk_cache_unreadable_entry(mock_func, error):
+    """Test disk_cache calls the function again when a cached result can't be loaded.
+
+    Results pickled under a different version of pandas raise attribute and import errors.
+    """
+
+    cached_func = disk_cache(ttl=60, tag="test")(mock_func)
+    cached_func(1)
+
+    with patch.object(diskcache.Cache, "get", side_effect=error):
+        assert cached_func(1) == [1, 2, 3]
+    assert mock_func.call_count == 2
+
+    # errors raised by the function itself are not mistaken for the cache being unusable
+    mock_func.side_effect = AttributeError
+    with patch.object(diskcache.Cache, "get", return_value=diskcache.ENOVAL):
+        with pytest.raises(AttributeError):
+            cached_func(1)
+
+
+@patch("imf_reader.utils.session.get")
+def test_make_conditional_request(mock_get):
+    """Test make_conditional_request reuses cached content when it has not changed."""
+
+    mock_get.return_value = Mock(
+        status_code=200, headers={"ETag": '"abc"'}, content=b"test content"
+    )
+    assert make_conditional_request("https://test.com", tag="test") == b"test content"
+    assert mock_get.call_args.kwargs["headers"] == {}
+
+    # the cached ETag is sent and the cached content returned when not modified
+    mock_get.return_value = Mock(status_code=304, headers={}, content=b"")
+    assert make_conditional_request("https://test.com", tag="test") == b"test content"
+    assert mock_get.call_args.kwargs["headers"] == {"If-None-Match": '"abc"'}
+
+    # once cleared, no conditional headers are sent
+    clear_disk_cache("test")
+    mock_get.return_value = Mock(status_code=200, headers={}, content=b"new content")
+    assert make_conditional_request("https://test.com", tag="test") == b"new content"
+    assert mock_get.call_args.kwargs["headers"] == {}
+
+    # the content cached for a single url can also be cleared
+    mock_get.return_value = Mock(
+        status_code=200, headers={"ETag": '"def"'}, content=b"new content"
+    )
+    make_conditional_request("https://test.com", tag="test")
+    clear_conditional_request("https://test.com")
+    make_conditional_request("https://test.com", tag="test")
+    assert mock_get.call_args.kwargs["headers"] == {}
+
+
+@patch("imf_reader.utils.session.get")
+def test_make_conditional_request_stream(mock_get):
+    """Test make_conditional_request streams content to disk and returns a file object."""
+
+    mock_get.return_value = Mock(
+        status_code=200,
+        headers={"Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"},
+        raw=io.BytesIO(b"test content"),
+    )
+    with make_conditional_request("https://test.com", tag="test", stream=True) as f:
+        assert f.read() == b"test content"
+    assert mock_get.call_args.kwargs["stream"] is True
+
+    # the cached content is returned as a file object when not modified
+    mock_get.return_value = Mock(status_code=304, headers={})
+    with make_conditional_request("https://test.com", tag="test", stream=True) as f:
+        assert f.read() == b"test content"
+    assert mock_get.call_args.kwargs["headers"] == {
+        "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"
+    }
+
+    # content without validators is not cached
+    clear_disk_cache("test")
+    mock_get.return_value = Mock(
+        status_code=200, headers={}, raw=io.BytesIO(b"new content")
+    )
+    with make_conditional_request("https://test.com", tag="test", stream=True) as f:
+        assert f.read() == b"new content"
+    assert clear_disk_cache("test") == 0
+
+
+@pytest.mark.parametrize(
+    "headers", [{"ETag": '"abc"'}, {}], ids=["cached", "not_cached"]
+)
+@patch("imf_reader.utils.session.get")
+def test_make_conditional_request_stream_read_error(mock_get, headers):
+    """Test a connection failure while the streamed content is read raises ConnectionError."""
+
+    raw = Mock(read=Mock(side_effect=urllib3.exceptions.ProtocolError("Broken")))
+    mock_get.return_value = Mock(status_code=200, headers=headers, raw=raw)
+
+    with pytest.raises(ConnectionError, match="Could not connect to https://test.com"):
+        make_conditional_request("https://test.com", tag="test", stream=True)
+    mock_get.return_value.close.assert_called_once()
+
+    # nothing is cached from the failed download
+    assert clear_disk_cache("test") == 0
+
+
+@patch("imf_reader.utils.session.get")
+def test_make_conditional_request_cache_unavailable(mock_get, tmp_path, monkeypatch):
+    """Test make_conditional_request downloads the content when the cache can't be used."""
+
+    (tmp_path / "file").touch()
+    monkeypatch.setattr("imf_reader.utils.CACHE_DIR", tmp_path / "file" / "cache")
+
+    mock_get.return_value = Mock(
+        status_code=200, headers={"ETag": '"abc"'}, raw=io.BytesIO(b"test content")
+    )
+    with make_conditional_request("https://test.com", tag="test", stream=True) as f:
+        assert f.read() == b"test content"
+    assert mock_get.call_args.kwargs["headers"] == {}
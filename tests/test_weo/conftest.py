@@ -0,0 +1,66 @@
+import io
+from zipfile import ZipFile
+
+import pandas as pd
+import pytest
+from unittest import mock
+
+from imf_reader.weo import reader, scraper
+
+
+@pytest.fixture(autouse=True)
+def clear_memory_cache():
+    """Clear the WEO data and urls cached in memory after each test."""
+    yield
+    reader._fetch.cache_clear()
+    scraper.find_sdmx_url.cache_clear()
+
+
+@pytest.fixture(scope="module")
+def mock_df():
+    """Small DataFrame returned by mocked fetches, which tests must not modify."""
+    return pd.DataFrame({"column1": [1, 2, 3], "column2": [4, 5, 6]})
+
+
+@pytest.fixture
+def test_url():
+    """Url of the mocked SDMX data."""
+    return "https://test.com"
+
+
+@pytest.fixture
+def mock_fetch(monkeypatch):
+    """Replace the reader's _fetch function with an autospecced mock built for each test.
+
+    The autospec checks the mock is called with the signature of `_fetch`, and a new one is
+    built for each test, as copies of a shared mock would share its child mocks.
+    """
+    mock_fetch = mock.create_autospec(reader._fetch)
+    monkeypatch.setattr(reader, "_fetch", mock_fetch)
+    return mock_fetch
+
+
+@pytest.fixture(scope="session")
+def valid_zip_bytes():
+    """Content of a valid zip file, built once for all tests."""
+    buffer = io.BytesIO()
+    with ZipFile(buffer, "w") as zipf:
+        zipf.writestr("test.txt", "test content")
+    return buffer.getvalue()
+
+
+@pytest.fixture(scope="session")
+def corrupt_zip_bytes():
+    """Content of a zip file with a valid central directory but a corrupt member."""
+    buffer = io.BytesIO()
+    with ZipFile(
+        buffer, "w"
+    ) as zipf:  # members are stored, so the content can be edited
+        zipf.writestr("test.txt", "test content")
+    return buffer.getvalue().replace(b"test content", b"best content")
+
+
+@pytest.fixture(scope="session")
+def bad_zip_bytes():
+    """Content which is not a valid zip file."""
+    return b"this is not a valid zip file"
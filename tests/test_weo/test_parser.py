@@ -1,18 +1,62 @@
 """Tests for weo parser module."""
 
+import re
+import io
 import pytest
 from unittest.mock import patch
 import pandas as pd
 import xml.etree.ElementTree as ET
 
-from imf_reader.weo.parser import SDMXParser
+from imf_reader.weo.parser import SDMXParser, _schema_digest
 from imf_reader.config import UnexpectedFileError
 
+# error messages raised when the folder does not hold exactly one of each file
+ONE_XML_FILE = re.compile("There should be exactly one xml file in the folder")
+ONE_XSD_FILE = re.compile("There should be exactly one xsd file in the folder")
+
+
+@pytest.fixture(scope="module")
+def schema():
+    """Schema content shared by the schema tests."""
+
+    return (
+        b"<xs:schema xmlns:xs='http://www.w3.org/2001/XMLSchema'>"
+        b"<!-- units -->"
+        b"<xs:simpleType name='IMF.CL_WEO_UNIT.1.0'>"
+        b"<xs:restriction base='xs:string'>"
+        b"<xs:enumeration value='A'><xs:annotation>"
+        b"<xs:documentation>Current international dollar</xs:documentation>"
+        b"</xs:annotation></xs:enumeration>"
+        b"</xs:restriction></xs:simpleType>"
+        b"</xs:schema>"
+    )
+
+
+@pytest.fixture(scope="module")
+def expected_series_df():
+    """Data expected from parsing a single observation, which tests must not modify."""
+
+    return pd.DataFrame(
+        [
+            {
+                "UNIT": "B",
+                "CONCEPT": "NGDP_D",
+                "REF_AREA": "111",
+                "FREQ": "A",
+                "LASTACTUALDATE": "2023",
+                "SCALE": "1",
+                "NOTES": "See notes for:  Gross domestic product, constant prices (National currency) Gross domestic product, current prices (National currency).",
+                "TIME_PERIOD": "1980",
+                "OBS_VALUE": "39.372",
+            }
+        ]
+    )
+
 
 class TestSDMXParser:
     """Tests for SDMXParser class."""
 
-    def test_parse_xml(self):
+    def test_parse_xml(self, expected_series_df):
         """Test for parse_xml method."""
 
         # Create a mock XML tree
@@ -55,52 +99,126 @@ class TestSDMXParser:
             series, "Obs", attrib={"TIME_PERIOD": "1980", "OBS_VALUE": "39.372"}
         )
 
-        tree = ET.ElementTree(root)
+        xml_file = io.BytesIO(ET.tostring(root))
 
         # Call the parse_xml method
-        df = SDMXParser.parse_xml(tree)
+        df = SDMXParser.parse_xml(xml_file)
+
+        # Assert that the returned DataFrame is as expected
+        pd.testing.assert_frame_equal(df, expected_series_df)
+
+    def test_parse_xml_multiple_series(self):
+        """Test for parse_xml method with several series with different attributes."""
+
+        xml_file = io.BytesIO(
+            b"<message:StructureSpecificData xmlns:message='urn:message'>"
+            b"<message:Header/>"
+            b"<message:DataSet>"
+            b"<Series UNIT='B' NOTES='note'>"
+            b"<Obs TIME_PERIOD='1980' OBS_VALUE='1'/><Obs TIME_PERIOD='1981'/>"
+            b"</Series>"
+            b"<Series UNIT='C'><Obs TIME_PERIOD='1980' OBS_VALUE='2'/></Series>"
+            b"</message:DataSet>"
+            b"</message:StructureSpecificData>"
+        )
+
+        df = SDMXParser.parse_xml(xml_file)
 
-        # Create the expected DataFrame
         expected_df = pd.DataFrame(
-            [
-                {
-                    "UNIT": "B",
-                    "CONCEPT": "NGDP_D",
-                    "REF_AREA": "111",
-                    "FREQ": "A",
-                    "LASTACTUALDATE": "2023",
-                    "SCALE": "1",
-                    "NOTES": "See notes for:  Gross domestic product, constant prices (National currency) Gross domestic product, current prices (National currency).",
-                    "TIME_PERIOD": "1980",
-                    "OBS_VALUE": "39.372",
-                }
-            ]
+            {
+                "UNIT": ["B", "B", "C"],
+                "NOTES": ["note", "note", None],
+                "TIME_PERIOD": ["1980", "1981", "1980"],
+                "OBS_VALUE": ["1", None, "2"],
+            }
+        )
+        pd.testing.assert_frame_equal(df, expected_df)
+
+    def test_parse_xml_labels(self):
+        """Test for parse_xml method with label lookups for series attributes."""
+
+        xml_file = io.BytesIO(
+            b"<message:StructureSpecificData xmlns:message='urn:message'>"
+            b"<message:DataSet>"
+            b"<Series UNIT='A' NOTES='note'>"
+            b"<Obs TIME_PERIOD='1980' OBS_VALUE='1'/><Obs TIME_PERIOD='1981'/>"
+            b"</Series>"
+            b"<Series UNIT='Z'><Obs TIME_PERIOD='1980' OBS_VALUE='2'/></Series>"
+            b"<Series NOTES='note'><Obs TIME_PERIOD='1980' OBS_VALUE='3'/></Series>"
+            b"</message:DataSet>"
+            b"</message:StructureSpecificData>"
         )
 
-        # Assert that the returned DataFrame is as expected
+        df = SDMXParser.parse_xml(
+            xml_file, {"UNIT": {"A": "Current international dollar"}}
+        )
+
+        expected_df = pd.DataFrame(
+            {
+                "UNIT_CODE": ["A", "A", "Z", None],
+                "NOTES": ["note", "note", None, "note"],
+                "TIME_PERIOD": ["1980", "1981", "1980", "1980"],
+                "OBS_VALUE": ["1", None, "2", "3"],
+                "UNIT_LABEL": ["Current international dollar"] * 2 + [None, None],
+            }
+        )
         pd.testing.assert_frame_equal(df, expected_df)
 
-    def test_lookup_schema_element(self):
-        """Test for lookup_schema_element method."""
+    def test_parse_xml_overlapping_attributes(self):
+        """Test for parse_xml method with an attribute on both the series and observations."""
+
+        xml_file = io.BytesIO(
+            b"<message:StructureSpecificData xmlns:message='urn:message'>"
+            b"<message:DataSet>"
+            b"<Series UNIT='A' NOTES='note'>"
+            b"<Obs TIME_PERIOD='1980' NOTES='obs note'/><Obs TIME_PERIOD='1981' UNIT='B'/>"
+            b"</Series>"
+            b"<Series UNIT='A'><Obs TIME_PERIOD='1980' OBS_VALUE='2'/></Series>"
+            b"<Series NOTES='other'><Obs TIME_PERIOD='1982' UNIT='B'/></Series>"
+            b"</message:DataSet>"
+            b"</message:StructureSpecificData>"
+        )
 
-        # Define the namespace
-        ns = {"xs": "http://www.w3.org/2001/XMLSchema"}
+        df = SDMXParser.parse_xml(xml_file, {"UNIT": {"A": "Dollars", "B": "Euros"}})
 
-        # Create a mock schema tree
-        root = ET.Element("{%s}schema" % ns["xs"], attrib={"xmlns:xs": ns["xs"]})
-        simpleType = ET.SubElement(
-            root, "{%s}simpleType" % ns["xs"], attrib={"name": "IMF.CL_WEO_UNIT.1.0"}
+        # the observation values take precedence, attributes only on the observations
+        # are labelled too, and the columns stay aligned
+        expected_df = pd.DataFrame(
+            {
+                "UNIT_CODE": ["A", "B", "A", "B"],
+                "NOTES": ["obs note", "note", None, "other"],
+                "TIME_PERIOD": ["1980", "1981", "1980", "1982"],
+                "OBS_VALUE": [None, None, "2", None],
+                "UNIT_LABEL": ["Dollars", "Euros", "Dollars", "Euros"],
+            }
         )
-        restriction = ET.SubElement(
-            simpleType, "{%s}restriction" % ns["xs"], attrib={"base": "xs:string"}
+        pd.testing.assert_frame_equal(df, expected_df)
+
+        # an attribute first found on the observations shares the columns of the series
+        xml_file = io.BytesIO(
+            b"<message:StructureSpecificData xmlns:message='urn:message'>"
+            b"<message:DataSet>"
+            b"<Series CONCEPT='C'><Obs UNIT='A'/></Series>"
+            b"<Series UNIT='A'><Obs CONCEPT='D'/></Series>"
+            b"</message:DataSet>"
+            b"</message:StructureSpecificData>"
         )
-        enumeration = ET.SubElement(
-            restriction, "{%s}enumeration" % ns["xs"], attrib={"value": "A"}
+
+        df = SDMXParser.parse_xml(xml_file, {"UNIT": {"A": "Dollars"}})
+
+        expected_df = pd.DataFrame(
+            {
+                "CONCEPT": ["C", "D"],
+                "UNIT_CODE": ["A", "A"],
+                "UNIT_LABEL": ["Dollars", "Dollars"],
+            }
         )
-        annotation = ET.SubElement(enumeration, "{%s}annotation" % ns["xs"])
-        documentation = ET.SubElement(annotation, "{%s}documentation" % ns["xs"])
-        documentation.text = "Current international dollar"
-        tree = ET.ElementTree(root)
+        pd.testing.assert_frame_equal(df, expected_df)
+
+    def test_lookup_schema_element(self, schema):
+        """Test for lookup_schema_element method."""
+
+        tree = ET.ElementTree(ET.fromstring(schema))
 
         # Call the lookup_schema_element method
         lookup_dict = SDMXParser.lookup_schema_element(tree, "IMF.CL_WEO_UNIT.1.0")
@@ -111,41 +229,30 @@ class TestSDMXParser:
         # Assert that the returned dictionary is as expected
         assert lookup_dict == expected_dict
 
-    @patch(
-        "imf_reader.weo.parser.SDMXParser.lookup_schema_element",
-        return_value={"A": "Current international dollar"},
-    )
-    def test_add_label_columns(self, mock_lookup):
-        """Test for add_label_columns method."""
-
-        # Create a mock DataFrame
-        data_df = pd.DataFrame(
-            [
-                {
-                    "UNIT": "A",
-                    "CONCEPT": "NGDP_D",
-                    "REF_AREA": "111",
-                    "FREQ": "A",
-                    "LASTACTUALDATE": "2023",
-                    "SCALE": "1",
-                    "NOTES": "See notes for:  Gross domestic product, constant prices (National currency) Gross domestic product, current prices (National currency).",
-                    "TIME_PERIOD": "1980",
-                    "OBS_VALUE": "39.372",
-                }
-            ]
+        # Look up several labels at once, with an empty dictionary for missing labels
+        lookups = SDMXParser.lookup_schema_elements(
+            tree, ["IMF.CL_WEO_UNIT.1.0", "IMF.CL_FREQ.1.0"]
         )
+        assert lookups == {"IMF.CL_WEO_UNIT.1.0": expected_dict, "IMF.CL_FREQ.1.0": {}}
 
-        # Call the add_label_columns method
-        result_df = SDMXParser.add_label_columns(data_df, None)
+    def test_get_label_lookups(self, schema):
+        """Test for get_label_lookups method."""
 
-        # Assert that the returned DataFrame is a DataFrame
-        assert isinstance(result_df, pd.DataFrame)
+        lookups = SDMXParser.get_label_lookups(schema)
+        assert lookups == {
+            "UNIT": {"A": "Current international dollar"},
+            "CONCEPT": {},
+            "REF_AREA": {},
+            "FREQ": {},
+            "SCALE": {},
+        }
 
-        assert "UNIT_LABEL" in result_df.columns
-        assert "UNIT_CODE" in result_df.columns
+        # the lookups are reused for the same schema content, read again from a file
+        assert SDMXParser.get_label_lookups(bytes(bytearray(schema))) is lookups
 
-        assert result_df["UNIT_CODE"].iloc[0] == "A"
-        assert result_df["UNIT_LABEL"].iloc[0] == "Current international dollar"
+        # the lookups are cached by a digest of the schema, not the schema itself
+        assert schema not in SDMXParser.get_label_lookups.cache
+        assert _schema_digest(schema) in SDMXParser.get_label_lookups.cache
 
     @patch("zipfile.ZipFile")
     def test_check_folder(self, mock_zip):
@@ -155,7 +262,7 @@ class TestSDMXParser:
         mock_zip.namelist.return_value = ["file1.xml", "file2.xml", "file1.xsd"]
         with pytest.raises(
             UnexpectedFileError,
-            match="There should be exactly one xml file in the folder",
+            match=ONE_XML_FILE,
         ):
             SDMXParser.check_folder(mock_zip)
 
@@ -163,7 +270,7 @@ class TestSDMXParser:
         mock_zip.namelist.return_value = ["file1.xsd"]
         with pytest.raises(
             UnexpectedFileError,
-            match="There should be exactly one xml file in the folder",
+            match=ONE_XML_FILE,
         ):
             SDMXParser.check_folder(mock_zip)
 
@@ -171,7 +278,7 @@ class TestSDMXParser:
         mock_zip.namelist.return_value = ["file1.xml", "file1.xsd", "file2.xsd"]
         with pytest.raises(
             UnexpectedFileError,
-            match="There should be exactly one xsd file in the folder",
+            match=ONE_XSD_FILE,
         ):
             SDMXParser.check_folder(mock_zip)
 
@@ -179,13 +286,15 @@ class TestSDMXParser:
         mock_zip.namelist.return_value = ["file1.xml"]
         with pytest.raises(
             UnexpectedFileError,
-            match="There should be exactly one xsd file in the folder",
+            match=ONE_XSD_FILE,
         ):
             SDMXParser.check_folder(mock_zip)
 
-        # check that the function doesn't raise an error when there is one xml and one xsd file
+        # check that the function returns the file names when there is one xml and one xsd file
+        mock_zip.namelist.reset_mock()
         mock_zip.namelist.return_value = ["file1.xml", "file1.xsd"]
-        assert SDMXParser.check_folder(mock_zip) is None
+        assert SDMXParser.check_folder(mock_zip) == ("file1.xml", "file1.xsd")
+        mock_zip.namelist.assert_called_once()
 
     def test_clean_numeric_columns(self):
         """Test for clean_numeric_columns method."""
@@ -1,80 +1,99 @@
 """Tests for reader module"""
 
+import re
 import pytest
-from unittest.mock import patch
+from unittest.mock import patch, Mock
 from datetime import datetime
+from types import SimpleNamespace
 import pandas as pd
 
 from imf_reader.weo import reader
 from imf_reader.config import NoDataError
 
 
-def test_validate_version():
-    """Test for validate_version function."""
-
-    # Test that the function correctly validates a valid version
-    assert reader.validate_version(("April", 2024)) == ("April", 2024)  # April
-    assert reader.validate_version(("October", 2024)) == ("October", 2024)  # October
-
-    # Test that the function correctly validates a valid version with different case and leading/trailing spaces
-    assert reader.validate_version((" april ", "2024")) == ("April", 2024)
-    assert reader.validate_version(("october", " 2024 ")) == ("October", 2024)
-    assert reader.validate_version((" apRil ", "2024")) == ("April", 2024)
-
-    # Test that the function raises a TypeError for an invalid month
-    with pytest.raises(TypeError):
-        reader.validate_version(("March", 2024))
-
-    # Test that the function raises a TypeError for an invalid year
-    with pytest.raises(TypeError, match="Invalid year. Must be an integer"):
-        reader.validate_version(("April", "twenty twenty four"))
-
-    # Test that the function raises a TypeError for an invalid version format
-    with pytest.raises(TypeError):
-        reader.validate_version("April 2024")
-
-
-@patch("imf_reader.weo.reader.datetime")
-def test_gen_latest_version(mock_datetime):
+@pytest.mark.parametrize(
+    "version, expected",
+    [
+        (("April", 2024), ("April", 2024)),
+        (("October", 2024), ("October", 2024)),
+        # different case and leading/trailing spaces
+        ((" april ", "2024"), ("April", 2024)),
+        (("october", " 2024 "), ("October", 2024)),
+        ((" apRil ", "2024"), ("April", 2024)),
+    ],
+)
+def test_validate_version(version, expected):
+    """Test for validate_version function with valid versions."""
+
+    assert reader.validate_version(version) == expected
+
+
+@pytest.mark.parametrize(
+    "version, match",
+    [
+        (("March", 2024), re.compile("Invalid month")),
+        (
+            ("April", "twenty twenty four"),
+            re.compile("Invalid year. Must be an integer"),
+        ),
+        ("April 2024", re.compile("Invalid version")),
+    ],
+    ids=["month", "year", "format"],
+)
+def test_validate_version_invalid(version, match):
+    """Test for validate_version function raising a TypeError for invalid versions."""
+
+    with pytest.raises(TypeError, match=match):
+        reader.validate_version(version)
+
+
+@pytest.mark.parametrize(
+    "now, expected",
+    [
+        (datetime(2024, 4, 1), ("April", 2024)),
+        (datetime(2024, 10, 1), ("October", 2024)),
+        # before April the latest version is from the previous October
+        (datetime(2024, 1, 1), ("October", 2023)),
+    ],
+)
+def test_gen_latest_version(monkeypatch, now, expected):
     """Test for gen_latest_version function."""
 
-    # Mock the current date to be in April
-    mock_datetime.now.return_value = datetime(2024, 4, 1)
-    assert reader.gen_latest_version() == ("April", 2024)
-
-    # Mock the current date to be in October
-    mock_datetime.now.return_value = datetime(2024, 10, 1)
-    assert reader.gen_latest_version() == ("October", 2024)
-
-    # Mock the current date to be in January
-    mock_datetime.now.return_value = datetime(2024, 1, 1)
-    assert reader.gen_latest_version() == ("October", 2023)
-
-
-def test_roll_back_version():
+    # fix the current date with a clock which returns it directly
+    monkeypatch.setattr(reader, "datetime", SimpleNamespace(now=lambda: now))
+    assert reader.gen_latest_version() == expected
+
+
+@pytest.mark.parametrize(
+    "version, expected",
+    [
+        # April rolls back to the previous October
+        (("April", 2024), ("October", 2023)),
+        # October rolls back to April of the same year
+        (("October", 2024), ("April", 2024)),
+    ],
+)
+def test_roll_back_version(version, expected):
     """Test for roll_back_version function."""
 
-    # Test that the function correctly rolls back from April to the previous October
-    assert reader.roll_back_version(("April", 2024)) == ("October", 2023)
+    assert reader.roll_back_version(version) == expected
 
-    # Test that the function correctly rolls back from October to April of the same year
-    assert reader.roll_back_version(("October", 2024)) == ("April", 2024)
 
-    # Test that the function raises a ValueError for an invalid month
+def test_roll_back_version_invalid():
+    """Test for roll_back_version function raising a ValueError for an invalid month."""
+
     with pytest.raises(ValueError):
         reader.roll_back_version(("March", 2024))
 
 
-@patch("imf_reader.weo.reader._fetch")
-def test_fetch_data(mock_fetch):
+def test_fetch_data(mock_fetch, mock_df):
     """Test for fetch_data method."""
 
     # Mock the _fetch function to return a specific DataFrame
-    mock_data = pd.DataFrame({"column1": [1, 2, 3], "column2": [4, 5, 6]})
-    mock_fetch.return_value = mock_data
+    mock_fetch.return_value = mock_df
 
     # Test that the function correctly fetches data when a version is passed
-    pd.testing.assert_frame_equal(reader.fetch_data(("April", 2024)), mock_data)
+    assert reader.fetch_data(("April", 2024)) is mock_df
     # check that validate_version is called
     mock_fetch.assert_called_once_with(("April", 2024))
 
@@ -84,23 +103,44 @@ def test_fetch_data(mock_fetch):
 
 
 @patch("imf_reader.weo.reader.gen_latest_version")
-@patch("imf_reader.weo.reader._fetch")
-def test_fetch_data_attribute(mock_fetch, mock_gen_latest_version):
+def test_fetch_data_attribute(mock_gen_latest_version, mock_fetch):
     """Test for fetch_data method attribute."""
 
-    mock_data = pd.DataFrame({"column1": [1, 2, 3], "column2": [4, 5, 6]})
+    # the data is only passed through, so any object can stand in for it
+    mock_data = object()
     mock_fetch.return_value = mock_data
     mock_gen_latest_version.return_value = ("April", 2024)
 
     # when a version is passed, check that the attribute is set
-    reader.fetch_data(("April", 2022))
+    assert reader.fetch_data(("April", 2022)) is mock_data
     assert reader.fetch_data.last_version_fetched == ("April", 2022)
 
     # when no version is passed, check that the attribute is set
-    reader.fetch_data()
+    assert reader.fetch_data() is mock_data
     assert reader.fetch_data.last_version_fetched == ("April", 2024)
 
 
+@patch("imf_reader.weo.reader.SDMXParser.parse")
+@patch("imf_reader.weo.reader.SDMXScraper.scrape")
+def test_fetch(mock_scrape, mock_parse):
+    """Test for _fetch caching the data in memory."""
+
+    mock_parse.return_value = pd.DataFrame({"column1": [1, 2, 3]})
+
+    df = reader._fetch(("April", 2024))
+    pd.testing.assert_frame_equal(df, mock_parse.return_value)
+    mock_scrape.assert_called_once_with("April", 2024)
+
+    # the SDMX files are parsed and then closed
+    folder = mock_scrape.return_value
+    mock_parse.assert_called_once_with(folder.__enter__.return_value)
+    folder.__exit__.assert_called_once()
+
+    # the data is reused from memory
+    assert reader._fetch(("April", 2024)) is df
+    mock_scrape.assert_called_once()
+
+
 @patch("imf_reader.weo.reader._fetch.cache_clear")
 def test_clear_cache(mock_cache_clear):
     """Test for clear_cache method."""
@@ -112,25 +152,22 @@ def test_clear_cache(mock_cache_clear):
     mock_cache_clear.assert_called_once()
 
 
-@patch("imf_reader.weo.reader._fetch")
-@patch("imf_reader.weo.reader.roll_back_version")
-@patch("imf_reader.weo.reader.gen_latest_version")
-def test_fetch_data_handles_NoDataError(
-    mock_gen_latest_version, mock_roll_back_version, mock_fetch
-):
+def test_fetch_data_handles_NoDataError(monkeypatch, mock_fetch, mock_df):
     """Test for fetch_data method when the version needs to be rolled back"""
 
     # Mock the gen_latest_version function to return a specific version
-    mock_gen_latest_version.return_value = ("April", 2024)
+    mock_gen_latest_version = Mock(return_value=("April", 2024))
+    monkeypatch.setattr(reader, "gen_latest_version", mock_gen_latest_version)
 
     # Mock the _fetch function to raise a NoDataError for the first call and return a DataFrame for the second call
     mock_fetch.side_effect = [
         NoDataError,
-        pd.DataFrame({"column1": [1, 2, 3], "column2": [4, 5, 6]}),
+        mock_df,
     ]
 
     # Mock the roll_back_version function to return a specific version
-    mock_roll_back_version.return_value = ("October", 2023)
+    mock_roll_back_version = Mock(return_value=("October", 2023))
+    monkeypatch.setattr(reader, "roll_back_version", mock_roll_back_version)
 
     # Call the fetch_data function without passing a version
     df = reader.fetch_data()
@@ -145,6 +182,4 @@ def test_fetch_data_handles_NoDataError(
     mock_roll_back_version.assert_called_once_with(("April", 2024))
 
     # Check that the DataFrame returned by fetch_data is as expected
-    pd.testing.assert_frame_equal(
-        df, pd.DataFrame({"column1": [1, 2, 3], "column2": [4, 5, 6]})
-    )
+    assert df is mock_df
@@ -1,32 +1,61 @@
 """Tests for weo scraper module."""
 
+import re
 import pytest
-from unittest.mock import patch, Mock
-from bs4 import BeautifulSoup
+from unittest.mock import patch
 import io
 from zipfile import ZipFile, BadZipFile
 
 from imf_reader.weo import scraper
 from imf_reader.config import NoDataError
 
+# error message raised when the SDMX link is not on the page
+SDMX_NOT_FOUND = re.compile("SDMX data not found")
 
-TEST_URL = "https://test.com"
 
+def test_get_page():
+    """Test get_page"""
 
-def test_get_soup():
-    """Test get_soup"""
-
-    # Mock the requests.get function
-    with patch("requests.get") as mock_get:
+    # Mock the session get function
+    with patch("imf_reader.utils.session.get") as mock_get:
         mock_get.return_value.status_code = 200
         mock_get.return_value.content = b"<html></html>"
 
         # Call the function with the mock object
-        soup = scraper.get_soup("April", 2021)
+        content = scraper.get_page("April", 2021)
 
         # Assert the result
-        assert isinstance(soup, BeautifulSoup)
-        assert str(soup) == "<html></html>"
+        assert content == b"<html></html>"
+
+
+@patch("imf_reader.weo.scraper.get_page")
+def test_find_sdmx_url(mock_get_page):
+    """Test find_sdmx_url caches the url found for a version"""
+
+    mock_get_page.return_value = (
+        b'<html><a class="link" href="test/url?a=1&amp;b=2">SDMX Data</a></html>'
+    )
+
+    url = "https://www.imf.org/test/url?a=1&b=2"
+    assert scraper.find_sdmx_url("April", 2021) == url
+    assert scraper.find_sdmx_url("April", 2021) == url
+    mock_get_page.assert_called_once_with("April", 2021)
+
+    # the url is also kept on disk for new sessions
+    scraper.find_sdmx_url.cache_clear()
+    assert scraper.find_sdmx_url("April", 2021) == url
+    mock_get_page.assert_called_once()
+
+    # the page is parsed if the link markup is not matched
+    mock_get_page.return_value = (
+        b"<html><a href='test/url'><span>SDMX Data</span></a></html>"
+    )
+    assert scraper.find_sdmx_url("October", 2021) == "https://www.imf.org/test/url"
+
+    # no url is cached when the data is not found
+    mock_get_page.return_value = b"<html></html>"
+    with pytest.raises(NoDataError):
+        scraper.find_sdmx_url("April", 2022)
 
 
 class TestSDMXScraper:
@@ -35,61 +64,64 @@ class TestSDMXScraper:
     def test_get_sdmx_url(self):
         """Test get_sdmx_url"""
 
-        # set up mock
-        mock_soup = Mock(spec=BeautifulSoup)
-        mock_soup.find.return_value.get.return_value = "test/url"
-
         # test expected behavior
-        result = scraper.SDMXScraper.get_sdmx_url(mock_soup)
+        content = b"<html><a href='test/url'> SDMX Data </a></html>"
+        result = scraper.SDMXScraper.get_sdmx_url(content)
         assert result == "https://www.imf.org/test/url"
 
         # Test when href is None
-        mock_soup.find.return_value.get.return_value = None
-        with pytest.raises(NoDataError, match="SDMX data not found"):
-            scraper.SDMXScraper.get_sdmx_url(mock_soup)
-
-        # test AttributeError
-        mock_soup.find.return_value.get.side_effect = AttributeError
-        with pytest.raises(NoDataError, match="SDMX data not found"):
-            scraper.SDMXScraper.get_sdmx_url(mock_soup)
-
-    @patch("imf_reader.weo.scraper.make_request")
-    def test_get_sdmx_folder(self, mock_request):
+        with pytest.raises(NoDataError, match=SDMX_NOT_FOUND):
+            scraper.SDMXScraper.get_sdmx_url(b"<html><a>SDMX Data</a></html>")
+
+        # Test when the link is not found
+        with pytest.raises(NoDataError, match=SDMX_NOT_FOUND):
+            scraper.SDMXScraper.get_sdmx_url(b"<html><a href='x'>Data</a></html>")
+
+        # Test when the page is empty
+        with pytest.raises(NoDataError, match=SDMX_NOT_FOUND):
+            scraper.SDMXScraper.get_sdmx_url(b"")
+
+    @patch("imf_reader.weo.scraper.clear_conditional_request")
+    @patch("imf_reader.weo.scraper.make_conditional_request")
+    def test_get_sdmx_folder(
+        self, mock_request, mock_clear, test_url, valid_zip_bytes, bad_zip_bytes
+    ):
         """Test get_sdmx_folder"""
 
         # set up mock
-        zip_content = io.BytesIO()
-        with ZipFile(zip_content, "w") as zipf:
-            zipf.writestr("test.txt", "test content")
-        mock_request.return_value.content = zip_content.getvalue()
+        zip_file = io.BytesIO(valid_zip_bytes)
+        mock_request.return_value = zip_file
 
         # Test expected behavior
-        folder = scraper.SDMXScraper.get_sdmx_folder(TEST_URL)
-        assert isinstance(folder, ZipFile)  # The result is a ZipFile object
-        assert folder.testzip() is None  # No exception is raised
-
-        # Test BadZipFile
-        bad_zip_content = io.BytesIO(b"this is not a valid zip file")
-        mock_request.return_value.content = bad_zip_content.getvalue()
+        with scraper.SDMXScraper.get_sdmx_folder(test_url) as folder:
+            assert isinstance(folder, ZipFile)  # The result is a ZipFile object
+            assert folder.testzip() is None  # No exception is raised
+        mock_request.assert_called_once_with(test_url, tag="weo", stream=True)
+
+        # the downloaded file is closed with the zip file, and is still cached
+        assert zip_file.closed
+        mock_clear.assert_not_called()
+
+        # Test BadZipFile, which also closes and clears the downloaded file
+        bad_zip_file = io.BytesIO(bad_zip_bytes)
+        mock_request.return_value = bad_zip_file
         with pytest.raises(BadZipFile):
-            scraper.SDMXScraper.get_sdmx_folder(TEST_URL)
-
-    @patch("imf_reader.weo.scraper.make_request")
-    @patch.object(ZipFile, "testzip")
-    def test_get_sdmx_folder_corrupt_zip(self, mock_testzip, mock_request):
-        """Test get_sdmx_folder with a corrupt zip file"""
-
-        # Create a valid zip file
-        valid_zip_content = io.BytesIO()
-        with ZipFile(valid_zip_content, "w") as zipf:
-            zipf.writestr("test.txt", "This is some test content")
-
-        # Set up the mock to return the valid zip file
-        mock_request.return_value.content = valid_zip_content.getvalue()
-
-        # Mock testzip to always return a non-None value
-        mock_testzip.return_value = lambda: "test.txt"
-
-        # Test that a BadZipFile exception is raised
-        with pytest.raises(BadZipFile, match="Corrupt zip file"):
-            scraper.SDMXScraper.get_sdmx_folder(TEST_URL)
+            scraper.SDMXScraper.get_sdmx_folder(test_url)
+        assert bad_zip_file.closed
+        mock_clear.assert_called_once_with(test_url)
+
+    @patch("imf_reader.weo.scraper.clear_conditional_request")
+    @patch("imf_reader.weo.scraper.make_conditional_request")
+    def test_get_sdmx_folder_corrupt_member(
+        self, mock_request, mock_clear, test_url, corrupt_zip_bytes
+    ):
+        """Test the cached download is cleared when a corrupt member is read"""
+
+        mock_request.return_value = io.BytesIO(corrupt_zip_bytes)
+
+        # the zip file opens, and the CRC of the member is checked when it is read
+        with pytest.raises(BadZipFile, match="Bad CRC-32"):
+            with scraper.SDMXScraper.get_sdmx_folder(test_url) as folder:
+                mock_clear.assert_not_called()
+                folder.read("test.txt")
+        mock_clear.assert_called_once_with(test_url)